@@ -1,17 +1,30 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_migrate import Migrate
-from models import db, User, Workout, Exercise, BodyMetrics, Meal, FoodItem, NutritionGoals, Supplement, WorkoutTemplate, TemplateExercise, TemplateSchedule, WeightPrediction, ExerciseBank
+from models import db, User, Workout, Exercise, ExerciseSet, BodyMetrics, Meal, FoodItem, NutritionGoals, Supplement, WorkoutTemplate, TemplateExercise, TemplateSchedule, WeightPrediction, ExerciseBank
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from sqlalchemy import func
 import requests
 import os
+import time
 from dotenv import load_dotenv
 from utils import normalize_exercise_name
+from queries import (
+    completed_workouts_query, paginate_workouts, parse_page_args,
+    parse_month, calendar_month_summary, workouts_on_local_day,
+)
+from training_load import refresh_training_load, rebuild_training_load
+from ml_client import MLClient, MLUnavailable
+from ml_events import MLEventDispatcher
 
 load_dotenv()
 
 ML_SERVICE_URL = os.getenv("ML_SERVICE_URL", "http://localhost:8001")
+# Pooled, circuit-broken client shared by every call to the ML service
+ml_client = MLClient(ML_SERVICE_URL)
+# Workout-write notifications to the ML service, delivered off the request path
+ml_events = MLEventDispatcher(ml_client)
 
 # App version
 VERSION = "3.0.1"
@@ -606,6 +619,7 @@ def populate_demo_data(user):
                 weight=avg_weight,
                 rest_time=ex_def['rest_time'],
                 set_data=json.dumps(set_data),
+                set_entries=ExerciseSet.from_set_data(set_data),
                 is_superset=ex_def.get('is_superset', False),
                 superset_exercise_name=ex_def.get('superset_exercise_name')
             )
@@ -836,6 +850,9 @@ def populate_demo_data(user):
             )
             db.session.add(supplement)
 
+    # Demo workouts were inserted directly; rebuild the fatigue rollup from them
+    rebuild_training_load(user)
+
     # Commit all demo data
     db.session.commit()
     print(f"[SUCCESS] Demo data populated for user '{user.username}'")
@@ -971,6 +988,15 @@ def demo():
 def index():
     return render_template('index.html')
 
+def _delete_workout_exercises(workout_id):
+    """Bulk-delete a workout's exercises and their exercise_set rows.
+
+    Query.delete() skips ORM cascades, so the set rows are removed first.
+    """
+    exercise_ids = db.session.query(Exercise.id).filter(Exercise.workout_id == workout_id)
+    ExerciseSet.query.filter(ExerciseSet.exercise_id.in_(exercise_ids.scalar_subquery())).delete(synchronize_session=False)
+    Exercise.query.filter_by(workout_id=workout_id).delete()
+
 @app.route('/log', methods=['GET', 'POST'])
 @login_required
 def log_workout():
@@ -988,6 +1014,7 @@ def log_workout():
         db.session.add(workout)
         db.session.flush()
 
+        exercises = []
         for ex in data.get('exercises', []) if not is_rest_day else []:
             import json
             # Handle weight being optional for bodyweight exercises
@@ -1012,15 +1039,16 @@ def log_workout():
                 rest_time=int(ex.get('rest_time', 0)),
                 equipment_type=equipment_type,
                 set_data=json.dumps(ex.get('set_data')) if ex.get('set_data') else None,
+                set_entries=ExerciseSet.from_set_data(ex.get('set_data')),
                 is_superset=bool(ex.get('is_superset', False)),
                 superset_exercise_name=normalized_superset_name
             )
             db.session.add(exercise)
+            exercises.append(exercise)
 
+        refresh_training_load(current_user, [workout.date])
         db.session.commit()
-        if not is_rest_day:
-            _fire_1rm_invalidate(current_user.id, [ex['name'] for ex in data.get('exercises', [])])
-        _fire_fatigue_invalidate(current_user.id)
+        _queue_1rm_update(current_user.id, exercises, current_user.training_data_version)
         return jsonify({'success': True, 'workout_id': workout.id})
 
     return render_template('log.html')
@@ -1028,16 +1056,29 @@ def log_workout():
 @app.route('/history')
 @login_required
 def history():
-    # Exclude draft workouts from history
-    workouts = Workout.query.filter_by(user_id=current_user.id, is_draft=False).order_by(Workout.date.desc()).all()
-    return render_template('history.html', workouts=workouts)
+    # The page loads its data from /api/calendar_data and /api/calendar_data/<date>
+    return render_template('history.html')
 
 @app.route('/api/workouts')
 @login_required
 def get_workouts():
+    """Newest-first page of completed workouts.
+
+    Query params: limit (default 50, max 200), before / after (cursor from a
+    previous response), from / to (YYYY-MM-DD or ISO datetime, UTC).
+    """
+    try:
+        page_args = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     # Exclude draft workouts
-    workouts = Workout.query.filter_by(user_id=current_user.id, is_draft=False).order_by(Workout.date.desc()).all()
-    return jsonify([w.to_dict() for w in workouts])
+    page = paginate_workouts(completed_workouts_query(current_user.id), **page_args)
+    return jsonify({
+        'workouts': [w.to_dict() for w in page['workouts']],
+        'next_cursor': page['next_cursor'],
+        'prev_cursor': page['prev_cursor'],
+    })
 
 @app.route('/api/workouts/<int:workout_id>')
 @login_required
@@ -1050,6 +1091,7 @@ def get_workout(workout_id):
 def delete_workout(workout_id):
     workout = Workout.query.filter_by(id=workout_id, user_id=current_user.id).first_or_404()
     db.session.delete(workout)
+    refresh_training_load(current_user, [workout.date])
     db.session.commit()
     return jsonify({'success': True})
 
@@ -1058,6 +1100,7 @@ def delete_workout(workout_id):
 def update_workout(workout_id):
     workout = Workout.query.filter_by(id=workout_id, user_id=current_user.id).first_or_404()
     data = request.get_json()
+    previous_date = workout.date
 
     # Update workout date and notes
     if 'date' in data:
@@ -1068,7 +1111,7 @@ def update_workout(workout_id):
     # Update exercises if provided
     if 'exercises' in data:
         # Delete existing exercises
-        Exercise.query.filter_by(workout_id=workout.id).delete()
+        _delete_workout_exercises(workout.id)
 
         # Add updated exercises
         for ex in data['exercises']:
@@ -1095,11 +1138,14 @@ def update_workout(workout_id):
                 rest_time=int(ex.get('rest_time', 0)),
                 equipment_type=equipment_type,
                 set_data=json.dumps(ex.get('set_data')) if ex.get('set_data') else None,
+                set_entries=ExerciseSet.from_set_data(ex.get('set_data')),
                 is_superset=bool(ex.get('is_superset', False)),
                 superset_exercise_name=normalized_superset_name
             )
             db.session.add(exercise)
 
+    # Refresh both days in case the workout moved
+    refresh_training_load(current_user, [previous_date, workout.date])
     db.session.commit()
     return jsonify({'success': True, 'workout': workout.to_dict()})
 
@@ -1136,7 +1182,7 @@ def save_draft_workout():
             draft.template_id = data.get('template_id')
 
         # Delete existing exercises and re-add
-        Exercise.query.filter_by(workout_id=draft.id).delete()
+        _delete_workout_exercises(draft.id)
     else:
         # Create new draft
         draft = Workout(
@@ -1173,6 +1219,7 @@ def save_draft_workout():
             rest_time=int(ex.get('rest_time', 0)),
             equipment_type=equipment_type,
             set_data=json.dumps(ex.get('set_data')) if ex.get('set_data') else None,
+            set_entries=ExerciseSet.from_set_data(ex.get('set_data')),
             is_superset=bool(ex.get('is_superset', False)),
             superset_exercise_name=normalized_superset_name
         )
@@ -1200,8 +1247,9 @@ def complete_draft_workout():
         draft.notes = data.get('notes', '')
 
     # Update exercises if provided
+    exercises = []
     if 'exercises' in data:
-        Exercise.query.filter_by(workout_id=draft.id).delete()
+        _delete_workout_exercises(draft.id)
 
         for ex in data.get('exercises', []):
             weight_value = ex.get('weight')
@@ -1224,18 +1272,21 @@ def complete_draft_workout():
                 rest_time=int(ex.get('rest_time', 0)),
                 equipment_type=equipment_type,
                 set_data=json.dumps(ex.get('set_data')) if ex.get('set_data') else None,
+                set_entries=ExerciseSet.from_set_data(ex.get('set_data')),
                 is_superset=bool(ex.get('is_superset', False)),
                 superset_exercise_name=normalized_superset_name
             )
             db.session.add(exercise)
+            exercises.append(exercise)
+    else:
+        exercises = list(draft.exercises)
 
     # Mark as complete (no longer a draft)
     draft.is_draft = False
+    refresh_training_load(current_user, [draft.date])
     db.session.commit()
 
-    if 'exercises' in data:
-        _fire_1rm_invalidate(current_user.id, [ex['name'] for ex in data.get('exercises', [])])
-    _fire_fatigue_invalidate(current_user.id)
+    _queue_1rm_update(current_user.id, exercises, current_user.training_data_version)
 
     return jsonify({'success': True, 'workout_id': draft.id, 'workout': draft.to_dict()})
 
@@ -1661,31 +1712,38 @@ def get_body_metrics():
 @app.route('/api/calendar_data')
 @login_required
 def calendar_data():
-    # Exclude draft workouts from calendar
-    workouts = Workout.query.filter_by(user_id=current_user.id, is_draft=False).all()
-    data = {}
+    """Per-day workout summaries for one month of the calendar.
 
+    Query params: month=YYYY-MM (defaults to the user's current local month).
+    Full workout details for a day come from /api/calendar_data/<YYYY-MM-DD>.
+    """
     # Get user's timezone offset to group workouts by local date
     offset_hours = current_user.timezone_offset or 0
 
-    for w in workouts:
-        # Apply timezone offset to get local date (not UTC date)
-        local_datetime = w.date + timedelta(hours=offset_hours)
-        date_str = local_datetime.strftime('%Y-%m-%d')
-        if date_str not in data:
-            data[date_str] = []
-        data[date_str].append({
-            'id': w.id,
-            'exercises': [ex.to_dict() for ex in w.exercises],  # Include full exercise details
-            'exercise_count': len(w.exercises),
-            'notes': w.notes,
-            'is_rest_day': w.is_rest_day,
-            'date': w.date.isoformat() + 'Z',  # Return as ISO format with UTC marker
-            'template_id': w.template_id,
-            'template_color': w.template.color if w.template else None,
-            'template_name': w.template.name if w.template else None
-        })
-    return jsonify(data)
+    month = request.args.get('month')
+    try:
+        if month:
+            month_start = parse_month(month)
+        else:
+            now_local = datetime.utcnow() + timedelta(hours=offset_hours)
+            month_start = datetime(now_local.year, now_local.month, 1)
+    except ValueError:
+        return jsonify({'error': 'month must be YYYY-MM'}), 400
+
+    return jsonify(calendar_month_summary(current_user.id, month_start, offset_hours))
+
+@app.route('/api/calendar_data/<day>')
+@login_required
+def calendar_day_data(day):
+    """Full details of the completed workouts logged on one local day."""
+    try:
+        day_start = datetime.strptime(day, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': 'day must be YYYY-MM-DD'}), 400
+
+    offset_hours = current_user.timezone_offset or 0
+    workouts = workouts_on_local_day(current_user.id, day_start, offset_hours)
+    return jsonify([dict(w.to_dict(), exercise_count=len(w.exercises)) for w in workouts])
 
 # ===== NUTRITION TRACKING =====
 
@@ -2521,8 +2579,12 @@ def update_timezone():
         offset_seconds = now.utcoffset().total_seconds()
         offset_hours = int(offset_seconds / 3600)
 
+        offset_changed = current_user.timezone_offset != offset_hours
         current_user.timezone = iana_name
         current_user.timezone_offset = offset_hours
+        if offset_changed:
+            # Workouts shift between local days; rebucket the fatigue rollup
+            rebuild_training_load(current_user)
         db.session.commit()
 
         return jsonify({
@@ -2536,7 +2598,10 @@ def update_timezone():
     if not isinstance(timezone_offset, int) or timezone_offset < -12 or timezone_offset > 14:
         return jsonify({'success': False, 'error': 'Invalid timezone offset'}), 400
 
+    offset_changed = current_user.timezone_offset != timezone_offset
     current_user.timezone_offset = timezone_offset
+    if offset_changed:
+        rebuild_training_load(current_user)
     db.session.commit()
 
     return jsonify({'success': True, 'timezone_offset': timezone_offset})
@@ -2555,29 +2620,24 @@ def user_weekly_goal():
     db.session.commit()
     return jsonify({'success': True, 'weekly_goal': goal})
 
-# Consistency tracking endpoint
-@app.route('/api/consistency')
-@login_required
-def get_consistency():
+def _consistency_payload(user, period=None, days=30):
     """
-    Calculate workout consistency based on scheduled workouts vs actual workouts
-    Query params: days (default 30) - number of days to look back
-                  period=week - use manual weekly_goal and count any workouts this Mon-Sun
+    Workout consistency for a user (shared by /api/consistency and /api/dashboard).
+    period='week' uses the manual weekly_goal and counts any workouts this Mon-Sun;
+    otherwise scheduled template days are compared with workouts over `days` days.
     """
     from datetime import datetime, timedelta
 
-    period = request.args.get('period')
-
     # --- Manual weekly goal path ---
     if period == 'week':
-        goal = current_user.weekly_goal or 3
+        goal = user.weekly_goal or 3
         end_date = datetime.now()
         today = end_date.date()
         monday = today - timedelta(days=today.weekday())
         start_date = datetime(monday.year, monday.month, monday.day)
 
         workouts = Workout.query.filter(
-            Workout.user_id == current_user.id,
+            Workout.user_id == user.id,
             Workout.is_draft == False,
             Workout.date >= start_date,
             Workout.date <= end_date
@@ -2588,16 +2648,14 @@ def get_consistency():
         completed_count = len(workout_dates)
         adherence_percentage = min(100, round(completed_count / goal * 100, 1)) if goal > 0 else 0
 
-        return jsonify({
+        return {
             'adherence_percentage': adherence_percentage,
             'scheduled_days': goal,
             'completed_days': completed_count,
             'total_workouts': len(workouts)
-        })
+        }
 
     # --- Template-based consistency path (30-day default) ---
-    days = int(request.args.get('days', 30))
-
     # Build a set of scheduled day_of_week values from both old and new methods
     scheduled_days_of_week = set()
 
@@ -2606,7 +2664,7 @@ def get_consistency():
         WorkoutTemplate,
         TemplateSchedule.template_id == WorkoutTemplate.id
     ).filter(
-        WorkoutTemplate.user_id == current_user.id
+        WorkoutTemplate.user_id == user.id
     ).all()
 
     for schedule in template_schedules:
@@ -2614,7 +2672,7 @@ def get_consistency():
 
     # Also check old day_of_week field for backwards compatibility
     old_scheduled_templates = WorkoutTemplate.query.filter_by(
-        user_id=current_user.id
+        user_id=user.id
     ).filter(WorkoutTemplate.day_of_week.isnot(None)).all()
 
     for template in old_scheduled_templates:
@@ -2622,19 +2680,19 @@ def get_consistency():
 
     # If no scheduled workouts, return 0%
     if not scheduled_days_of_week:
-        return jsonify({
+        return {
             'adherence_percentage': 0,
             'scheduled_days': 0,
             'completed_days': 0,
             'total_workouts': 0,
             'message': 'No workouts scheduled'
-        })
+        }
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
 
     workouts = Workout.query.filter(
-        Workout.user_id == current_user.id,
+        Workout.user_id == user.id,
         Workout.is_draft == False,
         Workout.date >= start_date,
         Workout.date <= end_date
@@ -2665,32 +2723,45 @@ def get_consistency():
 
     adherence_percentage = (completed_count / scheduled_count * 100) if scheduled_count > 0 else 0
 
-    return jsonify({
+    return {
         'adherence_percentage': round(adherence_percentage, 1),
         'scheduled_days': scheduled_count,
         'completed_days': completed_count,
         'total_workouts': len(workouts),
         'period_days': days
-    })
+    }
 
-@app.route('/api/hybrid_stat')
+# Consistency tracking endpoint
+@app.route('/api/consistency')
 @login_required
-def hybrid_stat():
+def get_consistency():
+    """
+    Calculate workout consistency based on scheduled workouts vs actual workouts
+    Query params: days (default 30) - number of days to look back
+                  period=week - use manual weekly_goal and count any workouts this Mon-Sun
+    """
+    return jsonify(_consistency_payload(
+        current_user,
+        period=request.args.get('period'),
+        days=int(request.args.get('days', 30)),
+    ))
+
+
+def _hybrid_stat_payload(user):
+    """Muscle-group balance over the last 30 days (shared by /api/hybrid_stat and /api/dashboard)."""
     from datetime import datetime, timedelta, date as date_type, timezone
 
-    offset_hours = current_user.timezone_offset or 0
+    offset_hours = user.timezone_offset or 0
 
     def to_local_date(dt):
         return (dt + timedelta(hours=offset_hours)).date()
 
     now_local = to_local_date(datetime.now(timezone.utc).replace(tzinfo=None))
 
-    all_workouts = Workout.query.filter_by(
-        user_id=current_user.id, is_draft=False
-    ).all()
+    all_workouts = completed_workouts_query(user.id).all()
 
     if not all_workouts:
-        return jsonify({'has_data': False, 'balance': None})
+        return {'has_data': False, 'balance': None}
 
     # Bucket by local date
     by_local_date = {}
@@ -2700,7 +2771,7 @@ def hybrid_stat():
 
     # ── BALANCE ────────────────────────────────────────────────────────
     bank_rows = ExerciseBank.query.filter(
-        (ExerciseBank.user_id.is_(None)) | (ExerciseBank.user_id == current_user.id)
+        (ExerciseBank.user_id.is_(None)) | (ExerciseBank.user_id == user.id)
     ).all()
     name_to_group = {r.name.lower(): r.muscle_group for r in bank_rows if r.muscle_group}
 
@@ -2737,10 +2808,16 @@ def hybrid_stat():
         'no_tracked_groups':     len(trained_groups) == 0,
     }
 
-    return jsonify({
+    return {
         'has_data': True,
         'balance':  balance_data,
-    })
+    }
+
+
+@app.route('/api/hybrid_stat')
+@login_required
+def hybrid_stat():
+    return jsonify(_hybrid_stat_payload(current_user))
 
 
 # ---------------------------------------------------------------------------
@@ -2763,43 +2840,44 @@ _1RM_SLUG_MAP: dict[str, str] = {
     "Barbell Row": "barbell-row", "Barbell Rows": "barbell-row",
     "Rows": "barbell-row", "BB Row": "barbell-row",
 }
+_1RM_SLUGS = list(dict.fromkeys(_1RM_SLUG_MAP.values()))
 
 
-def _fire_fatigue_invalidate(user_id: int) -> None:
-    """Fire-and-forget fatigue cache invalidation.
+def _1rm_observed_sets(exercise) -> list:
+    """(weight, reps) pairs the 1RM model reads from an exercise.
 
-    Errors are silently swallowed — workout saves must never fail because
-    of ML service availability.
+    Same rules as the ML service's _fetch_sets: completed set rows with
+    weight and reps > 0, else the top-level fields repeated `sets` times.
     """
-    try:
-        requests.post(
-            f"{ML_SERVICE_URL}/api/ml/fatigue/invalidate",
-            json={"user_id": user_id},
-            timeout=2,
-        )
-    except Exception:
-        pass
-
-
-def _fire_1rm_invalidate(user_id: int, exercise_names: list) -> None:
-    """Fire-and-forget 1RM cache invalidation for any tracked movements.
-
-    Errors are silently swallowed — workout saves must never fail because
-    of ML service availability.
+    rows = sorted(exercise.set_entries, key=lambda s: s.set_number)
+    observed = [
+        {"weight": s.weight, "reps": s.reps}
+        for s in rows
+        if s.completed and s.weight and s.weight > 0 and s.reps and s.reps > 0
+    ]
+    if observed:
+        return observed
+    if exercise.weight and exercise.weight > 0 and exercise.reps and exercise.reps > 0:
+        return [{"weight": exercise.weight, "reps": exercise.reps}] * (exercise.sets or 1)
+    return []
+
+
+def _queue_1rm_update(user_id: int, exercises: list, data_version: int) -> None:
+    """Queue a 1RM update for a newly saved workout (see ml_events.py).
+
+    Sends the workout's sets for every tracked movement ([] for movements
+    it does not contain), with the user's new training_data_version, so
+    the ML service can fold them into the stored posteriors instead of
+    refitting from scratch. Delivery happens on a background thread and is
+    best effort: a lost update shows up as a version mismatch and the ML
+    service refits.
     """
-    seen_slugs: set[str] = set()
-    for name in exercise_names:
-        slug = _1RM_SLUG_MAP.get(name)
-        if slug and slug not in seen_slugs:
-            seen_slugs.add(slug)
-            try:
-                requests.post(
-                    f"{ML_SERVICE_URL}/api/ml/bayesian/1rm/update",
-                    json={"movement": slug, "weight": 0.0, "reps": 0, "user_id": user_id},
-                    timeout=2,
-                )
-            except Exception:
-                pass
+    sets_by_slug: dict[str, list] = {slug: [] for slug in _1RM_SLUGS}
+    for exercise in exercises:
+        slug = _1RM_SLUG_MAP.get(exercise.name)
+        if slug:
+            sets_by_slug[slug].extend(_1rm_observed_sets(exercise))
+    ml_events.workout_saved(user_id, data_version, sets_by_slug)
 
 
 @app.route('/api/1rm/update', methods=['POST'])
@@ -2808,47 +2886,53 @@ def proxy_1rm_update():
     """Proxy POST /api/1rm/update → ML service, injecting user_id from session."""
     data = request.get_json() or {}
     data["user_id"] = current_user.id
-    try:
-        resp = requests.post(
-            f"{ML_SERVICE_URL}/api/ml/bayesian/1rm/update",
-            json=data,
-            timeout=30,
-        )
-        return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.RequestException:
-        return jsonify({"updated": False, "error": "ml_service_unavailable"}), 503
+    return ml_client.proxy(
+        "POST", "/api/ml/bayesian/1rm/update", timeout=30, json=data,
+        unavailable={"updated": False, "error": "ml_service_unavailable"},
+    )
+
+
+@app.route('/api/1rm')
+@login_required
+def proxy_1rm_many():
+    """Proxy GET /api/1rm → ML service: every tracked movement in one round-trip.
+
+    ?movements= is forwarded (default "all"; or a comma-separated slug list).
+    """
+    params = {
+        "user_id": current_user.id,
+        "movements": request.args.get("movements", "all"),
+    }
+    return ml_client.proxy("GET", "/api/ml/bayesian/1rm", timeout=30, params=params)
 
 
 @app.route('/api/1rm/<movement>')
 @login_required
 def proxy_1rm(movement):
-    """Proxy GET /api/1rm/{movement} → ML service, injecting user_id from session."""
-    try:
-        resp = requests.get(
-            f"{ML_SERVICE_URL}/api/ml/bayesian/1rm/{movement}",
-            params={"user_id": current_user.id},
-            timeout=30,
-        )
-        return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.RequestException:
-        return jsonify({"error": "ml_service_unavailable"}), 503
+    """Proxy GET /api/1rm/{movement} → ML service, injecting user_id from session.
+
+    Pass ?precise=true to request the full NUTS fit instead of the fast grid engine.
+    """
+    params = {"user_id": current_user.id}
+    if request.args.get("precise"):
+        params["precise"] = request.args.get("precise")
+    return ml_client.proxy("GET", f"/api/ml/bayesian/1rm/{movement}", timeout=30, params=params)
 
 
 @app.route('/api/rag/query', methods=['POST'])
 @login_required
 def proxy_rag_query():
-    """Proxy POST /api/rag/query → ML service, injecting user_id from session."""
+    """Proxy POST /api/rag/query → ML service, injecting user_id from session.
+
+    With {"stream": true} the ML service's server-sent events are relayed
+    unbuffered, so citations and answer tokens reach the browser as they
+    are produced.
+    """
     data = request.get_json() or {}
     data["user_id"] = current_user.id
-    try:
-        resp = requests.post(
-            f"{ML_SERVICE_URL}/api/ml/rag/query",
-            json=data,
-            timeout=30,
-        )
-        return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.RequestException:
-        return jsonify({"error": "ml_service_unavailable"}), 503
+    if data.get("stream"):
+        return ml_client.stream("POST", "/api/ml/rag/query", timeout=30, json=data)
+    return ml_client.proxy("POST", "/api/ml/rag/query", timeout=30, json=data)
 
 
 
@@ -2861,15 +2945,9 @@ def proxy_rag_query():
 @login_required
 def proxy_fatigue_status():
     """Proxy GET /api/fatigue/status → ML service, injecting user_id from session."""
-    try:
-        resp = requests.get(
-            f"{ML_SERVICE_URL}/api/ml/fatigue/status",
-            params={"user_id": current_user.id},
-            timeout=10,
-        )
-        return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.RequestException:
-        return jsonify({"error": "ml_service_unavailable"}), 503
+    return ml_client.proxy(
+        "GET", "/api/ml/fatigue/status", timeout=10, params={"user_id": current_user.id}
+    )
 
 
 @app.route('/api/fatigue/history')
@@ -2877,30 +2955,112 @@ def proxy_fatigue_status():
 def proxy_fatigue_history():
     """Proxy GET /api/fatigue/history → ML service, injecting user_id from session."""
     days = request.args.get('days', 28)
-    try:
-        resp = requests.get(
-            f"{ML_SERVICE_URL}/api/ml/fatigue/history",
-            params={"user_id": current_user.id, "days": days},
-            timeout=10,
-        )
-        return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.RequestException:
-        return jsonify({"error": "ml_service_unavailable"}), 503
+    return ml_client.proxy(
+        "GET", "/api/ml/fatigue/history", timeout=10,
+        params={"user_id": current_user.id, "days": days},
+    )
 
 
 @app.route('/api/fatigue/invalidate', methods=['POST'])
 @login_required
 def proxy_fatigue_invalidate():
     """Proxy POST /api/fatigue/invalidate → ML service."""
+    return ml_client.proxy(
+        "POST", "/api/ml/fatigue/invalidate", timeout=5, json={"user_id": current_user.id},
+        unavailable={"invalidated": False, "error": "ml_service_unavailable"},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Dashboard — one round-trip for everything the home page shows. The ML
+# sections are requested concurrently while the local sections are computed,
+# so the response takes as long as the slowest section rather than the sum.
+# ---------------------------------------------------------------------------
+
+# Seconds the dashboard waits for the ML sections; late ones come back as timeouts
+DASHBOARD_TIMEOUT = float(os.getenv("DASHBOARD_TIMEOUT", "3"))
+
+# (path, extra params) per ML section
+_DASHBOARD_ML_SECTIONS = {
+    "fatigue":         ("/api/ml/fatigue/status", {}),
+    "fatigue_history": ("/api/ml/fatigue/history", {"days": 28}),
+}
+
+# Threads are created on first submit, so each gunicorn worker gets its own
+_dashboard_pool = ThreadPoolExecutor(
+    max_workers=len(_DASHBOARD_ML_SECTIONS) * 2, thread_name_prefix="dashboard"
+)
+
+
+def _dashboard_ml_call(path: str, params: dict, deadline: float) -> dict:
+    """Fetch one ML section; runs on the dashboard pool.
+
+    The read timeout is whatever is left of the dashboard's budget, so the
+    call gives up about when the dashboard stops waiting for it and never
+    holds a pool thread past the request that started it. Running out of
+    that budget is the dashboard's deadline, not a sign the service is down,
+    so those timeouts do not count towards the circuit breaker.
+    """
+    started = time.perf_counter()
+    remaining = deadline - started
+    if remaining <= 0:
+        return {"status": 504, "data": None, "error": "timeout", "ms": 0.0}
     try:
-        resp = requests.post(
-            f"{ML_SERVICE_URL}/api/ml/fatigue/invalidate",
-            json={"user_id": current_user.id},
-            timeout=5,
+        resp = ml_client.request("GET", path, timeout=remaining, count_timeout=False, params=params)
+        section = {"status": resp.status_code, "data": resp.json()}
+    except MLUnavailable:
+        section = {"status": 503, "data": None, "error": "ml_service_unavailable"}
+    except ValueError:
+        section = {"status": 502, "data": None, "error": "invalid_response"}
+    section["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return section
+
+
+@app.route('/api/dashboard')
+@login_required
+def dashboard():
+    """Home-page data in one payload.
+
+    Sections: consistency (this week), balance (as /api/hybrid_stat),
+    fatigue and fatigue_history (28 days) — what the home page renders.
+    Each section is {"status", "data", "ms"} plus "error" when it failed;
+    an ML section still pending after DASHBOARD_TIMEOUT seconds is returned
+    as {"status": 504, "error": "timeout"} and the rest are served anyway.
+    """
+    started = time.perf_counter()
+    deadline = started + DASHBOARD_TIMEOUT
+    futures = {
+        name: _dashboard_pool.submit(
+            _dashboard_ml_call, path, {"user_id": current_user.id, **params}, deadline
         )
-        return jsonify(resp.json()), resp.status_code
-    except requests.exceptions.RequestException:
-        return jsonify({"invalidated": False, "error": "ml_service_unavailable"}), 503
+        for name, (path, params) in _DASHBOARD_ML_SECTIONS.items()
+    }
+
+    # Local sections run on the request thread while the ML calls are in flight
+    sections = {}
+    local_sections = {
+        "consistency": lambda: _consistency_payload(current_user, period='week'),
+        "balance":     lambda: _hybrid_stat_payload(current_user),
+    }
+    for name, compute in local_sections.items():
+        section_started = time.perf_counter()
+        sections[name] = {"status": 200, "data": compute()}
+        sections[name]["ms"] = round((time.perf_counter() - section_started) * 1000, 1)
+
+    for name, future in futures.items():
+        try:
+            sections[name] = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except FuturesTimeout:
+            # The call times out on its own moments later and is discarded
+            sections[name] = {
+                "status": 504, "data": None, "error": "timeout",
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+
+    return jsonify({
+        "sections": sections,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
 
 
 @app.route('/strength')
@@ -0,0 +1,26 @@
+"""
+Rebuild the daily_training_load rollup from the workout tables.
+
+Run once after migrations 014/015, or any time the rollup is suspected to
+be out of step. Safe to re-run: each user's rows are dropped and recomputed.
+
+    python backfill_training_load.py              # every user
+    python backfill_training_load.py --user-id 7  # one user
+"""
+import argparse
+
+from app import app, db
+from models import User
+from training_load import rebuild_training_load
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--user-id', type=int, help='only rebuild this user')
+args = parser.parse_args()
+
+with app.app_context():
+    users = User.query.filter_by(id=args.user_id).all() if args.user_id else User.query.all()
+    for user in users:
+        days = rebuild_training_load(user)
+        db.session.commit()
+        print(f"✓ {user.username}: {days} days")
+    print(f"✓ Rebuilt training load for {len(users)} users")
@@ -0,0 +1,79 @@
+"""
+Grid vs NUTS benchmark for the Bayesian 1RM estimator.
+
+Fits the same datasets with both engines and reports wall time and how far
+the grid summary lies from the NUTS one, in units of the NUTS posterior sd
+(NUTS itself carries Monte Carlo error of a few hundredths of an sd).
+
+Usage (from fitglyph-ml/):
+    python -m bayesian.benchmark                          # synthetic datasets
+    python -m bayesian.benchmark --user-id 3 --movement back-squat
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bayesian.one_rm import HDI_PROB, MOVEMENT_MAP, _fetch_sets, _fit_nuts, epley
+from bayesian.posterior import grid_posterior
+
+_SYNTHETIC_SIZES = (1, 3, 6, 12, 30, 100, 300)
+
+
+def _synthetic(rng: np.random.Generator, n: int) -> np.ndarray:
+    """n noisy Epley readings around a random true 1RM."""
+    true_1rm = rng.uniform(60, 220)
+    return true_1rm + rng.normal(0, rng.uniform(2, 15), n)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _compare(label: str, epley_vals: np.ndarray) -> None:
+    mu_prior = float(epley_vals[0])
+    grid, grid_ms = _timed(grid_posterior, epley_vals, mu_prior, HDI_PROB)
+    nuts, nuts_ms = _timed(_fit_nuts, epley_vals, mu_prior)
+
+    sd = nuts["posterior_sd"] or 1.0
+    deltas = [
+        abs(grid[key] - nuts[key]) / sd
+        for key in ("posterior_mean", "hdi_lower", "hdi_upper")
+    ]
+    print(
+        f"{label:<24} {len(epley_vals):>5} "
+        f"{grid_ms:>9.1f} {nuts_ms:>10.0f} {nuts_ms / grid_ms:>8.0f}x "
+        + " ".join(f"{d:>7.3f}" for d in deltas)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the grid and NUTS 1RM engines.")
+    parser.add_argument("--user-id", type=int, help="benchmark a real user's logged sets")
+    parser.add_argument("--movement", choices=sorted(MOVEMENT_MAP), help="movement slug (with --user-id)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for synthetic datasets")
+    args = parser.parse_args()
+
+    print(f"{'dataset':<24} {'n':>5} {'grid ms':>9} {'nuts ms':>10} {'speedup':>9} "
+          f"{'Δmean':>7} {'Δlower':>7} {'Δupper':>7}   (Δ in NUTS posterior sd)")
+
+    if args.user_id is not None:
+        movements = [args.movement] if args.movement else sorted(MOVEMENT_MAP)
+        for slug in movements:
+            observed, _ = _fetch_sets(args.user_id, MOVEMENT_MAP[slug])
+            if observed:
+                _compare(slug, np.array([epley(w, r) for w, r in observed]))
+            else:
+                print(f"{slug:<24} no logged sets")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    for n in _SYNTHETIC_SIZES:
+        _compare(f"synthetic n={n}", _synthetic(rng, n))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,26 @@
 """
-Trace cache for Bayesian 1RM model.
+Posterior summary cache for Bayesian 1RM model.
 
-Caches PyMC trace objects per (user_id, movement) pair to avoid
-re-sampling from scratch on every request. Cache is invalidated
-when a new set is logged for the relevant movement.
+Stores a compact summary of each fitted posterior per (user_id, movement)
+pair — computed once at fit time — so a cache hit is a lookup rather than
+a re-extraction of the HDI from a full trace. Cache is invalidated when a
+new set is logged for the relevant movement.
 
-Cache is in-process and in-memory. Traces are kept forever until
-explicitly invalidated — there is no TTL because sampling is expensive
-and 1RM changes slowly. The POST /1rm/update endpoint triggers
-invalidation after a new workout is logged.
+Two tiers:
+  hot   — the shared "one_rm" cache (caching/backends.py), a bounded LRU
+  disk  — the persistent result store (caching/store.py) so fitted
+          summaries survive restarts and are shared by every worker; read
+          on a hot miss and promoted back into the hot tier, and loaded
+          into the hot tier at startup (warm()). Rows are stamped with
+          MODEL_VERSION, so a model change retires old summaries.
+
+There is no TTL: each entry is stamped with the user's training_data_version
+at fit time, and GET /1rm treats an entry whose stamp differs from the
+current version as out of date. When a new workout is logged, POST
+/1rm/update folds its sets into the entry's sufficient stats and restamps
+it; failing that (or every ONE_RM_REFIT_EVERY updates) it marks the entry
+stale (still served, flagged as such) and queues a background refit
+(bayesian/worker.py) that replaces it.
 
 Cache key: (user_id: int, movement: str) where movement is the canonical
 DB name (e.g. "Back Squat"), not the URL slug.
@@ -16,43 +28,97 @@ DB name (e.g. "Back Squat"), not the URL slug.
 
 from datetime import datetime, timezone
 
+from bayesian.posterior import MODEL_VERSION
+from caching.backends import get_cache
+from caching.store import STORE_WARM_LIMIT, ResultStore
+
 # Key: (user_id: int, movement: str)
-# Value: {"trace": InferenceData, "n_sessions": int, "last_updated": str (ISO8601 UTC)}
-_cache: dict[tuple[int, str], dict] = {}
+# Value: {
+#     "posterior_mean": float, "posterior_sd": float,
+#     "hdi_lower": float, "hdi_upper": float, "hdi_prob": float,
+#     "method": "grid" | "nuts", "stale": bool,
+#     "data_version": int | None (users.training_data_version the fit read),
+#     "n_sessions": int, "last_updated": str (ISO8601 UTC),
+#     "stats": {"n": int, "ybar": float, "S": float, "mu0": float},
+#     "updates_since_refit": int (absent after a full fit),
+# }
+_cache = get_cache("one_rm")
+_store = ResultStore("one_rm", engine_version=MODEL_VERSION)
 
 
-def get_cached_trace(user_id: int, movement: str) -> dict | None:
-    """Return the cached entry for (user_id, movement), or None if not cached.
+def warm(limit: int = STORE_WARM_LIMIT) -> int:
+    """Copy the newest stored summaries into the hot tier; returns the count."""
+    rows = _store.load(limit)
+    for key, summary, _, _ in rows:
+        _cache.set(key, summary)
+    return len(rows)
 
-    Entry shape: {"trace": InferenceData, "n_sessions": int, "last_updated": str}
-    """
-    return _cache.get((user_id, movement))
 
+def get_cached_summary(user_id: int, movement: str) -> dict | None:
+    """Return the cached summary for (user_id, movement), or None if not cached."""
+    key = (user_id, movement)
+    summary = _cache.get(key)
+    if summary is None:
+        summary = _store.get(key)
+        if summary is not None:
+            _cache.set(key, summary)
+    return summary
 
-def set_cached_trace(
+
+def set_cached_summary(
     user_id: int,
     movement: str,
-    trace,
+    summary: dict,
     n_sessions: int,
-) -> None:
-    """Store a PyMC trace in the cache alongside metadata.
+    stale: bool = False,
+    data_version: int | None = None,
+) -> dict:
+    """Store a posterior summary in both tiers alongside metadata.
 
     Args:
-        user_id:   Flask user ID
-        movement:  Canonical exercise name (e.g. "Back Squat")
-        trace:     arviz.InferenceData from pm.sample()
-        n_sessions: Number of unique workout dates used to fit the model
+        user_id:      Flask user ID
+        movement:     Canonical exercise name (e.g. "Back Squat")
+        summary:      Posterior summary from _run_model() (mean, sd, HDI bounds)
+        n_sessions:   Number of unique workout dates used to fit the model
+        stale:        True when the data has changed since this fit started
+        data_version: The user's training_data_version when the sets were read
+
+    Returns the stored entry.
     """
-    _cache[(user_id, movement)] = {
-        "trace": trace,
+    entry = {
+        **summary,
+        "stale": stale,
+        "data_version": data_version,
         "n_sessions": n_sessions,
         "last_updated": datetime.now(timezone.utc).isoformat(),
     }
+    key = (user_id, movement)
+    _store.put(key, entry, data_version=data_version)
+    _cache.set(key, entry)
+    return entry
+
+
+def mark_stale(user_id: int, movement: str) -> dict | None:
+    """Flag the cached summary for (user_id, movement) as out of date.
+
+    The entry keeps being served (with stale=True) until a refit replaces
+    it. Returns the entry, or None if nothing was cached.
+    """
+    entry = get_cached_summary(user_id, movement)
+    if entry is None:
+        return None
+    entry = {**entry, "stale": True}
+    key = (user_id, movement)
+    _store.put(key, entry, data_version=entry.get("data_version"))
+    _cache.set(key, entry)
+    return entry
 
 
 def invalidate(user_id: int, movement: str) -> None:
-    """Remove the cached trace for (user_id, movement).
+    """Remove the cached summary for (user_id, movement) from both tiers.
 
-    Safe to call when no entry exists — pops silently.
+    Safe to call when no entry exists.
     """
-    _cache.pop((user_id, movement), None)
+    key = (user_id, movement)
+    _cache.delete(key)
+    _store.delete(key)
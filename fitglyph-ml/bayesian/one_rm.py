@@ -8,26 +8,51 @@ Each logged set is treated as a noisy Epley-formula reading of that latent:
 Output is the 94% Highest Density Interval (HDI), not a point estimate.
 The interval IS the result — it must always be shown in the UI.
 
-Stack: pymc, arviz
+Two engines fit the same model:
+  grid    (default) — closed-form Normal posterior per sigma on a fixed
+                      sigma grid (bayesian/posterior.py); milliseconds
+  nuts    (?precise=true) — full PyMC NUTS sampling; seconds
+`python -m bayesian.benchmark` compares the two.
+
+NUTS fits and refits after new sets are logged run in a background process
+pool (bayesian/worker.py); requests are answered from the last summary with
+HTTP 202 while a refit is pending. Between refits, POST /1rm/update folds
+the sets of a new workout into the stored sufficient statistics instead.
+Every summary is stamped with the user's training_data_version, so a
+summary that missed an update is detected and refitted on read.
+
+GET /1rm?movements=all answers for every tracked movement at once: one
+query over all aliases, one vectorized grid fit across movements.
+
+Stack: numpy; pymc + arviz for the precise engine (imported on first use)
 
 Tracked movements (compound only):
     Back Squat, Conventional Deadlift, Bench Press (Flat Barbell),
     Overhead Press (Standing Barbell), Romanian Deadlift, Barbell Row
 """
 
-import json
 import os
+import threading
 
-import arviz as az
 import numpy as np
-import pymc as pm
 from dotenv import load_dotenv
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy import create_engine, text
 
-from bayesian.cache import get_cached_trace, invalidate, set_cached_trace
+from bayesian.cache import get_cached_summary, mark_stale, set_cached_summary
+from bayesian.posterior import (
+    HALF_NORMAL_SCALE,
+    PRIOR_SD_FRACTION,
+    combine_stats,
+    grid_posterior,
+    grid_posterior_batch,
+    grid_posterior_from_stats,
+    sufficient_stats,
+)
+from bayesian.worker import enqueue_fit, is_fitting
+from caching.versions import fetch_data_version
 
 load_dotenv()
 
@@ -100,88 +125,150 @@ def _fetch_sets(user_id: int, movement_name: str) -> tuple[list[tuple[float, int
           - observed_sets: list of (weight, reps) tuples ordered chronologically
           - n_sessions: count of unique workout dates (used for uncertainty note)
 
-    Parses set_data JSON preferentially; falls back to top-level
-    (sets, reps, weight) columns when set_data is absent or unparseable.
-    The `completed` field in set_data defaults to True when absent.
-    Only includes sets where reps > 0 and weight > 0.
+    Reads per-set rows from exercise_set preferentially; falls back to the
+    top-level (sets, reps, weight) columns when an exercise has no usable
+    set rows. Only completed sets with reps > 0 and weight > 0 are used.
+    """
+    return _fetch_sets_many(user_id, [movement_name])[movement_name]
+
+
+def _fetch_sets_many(
+    user_id: int, movement_names: list[str]
+) -> dict[str, tuple[list[tuple[float, int]], int]]:
+    """_fetch_sets for several movements in a single query.
+
+    Every alias of every requested movement goes into one IN clause; rows
+    are mapped back to their canonical movement by exercise name.
+
+    Returns {movement_name: (observed_sets, n_sessions)} with an entry for
+    every requested movement (empty when nothing was logged).
     """
-    aliases = MOVEMENT_ALIASES.get(movement_name, [movement_name])
+    canonical: dict[str, str] = {}
+    for movement_name in movement_names:
+        for alias in MOVEMENT_ALIASES.get(movement_name, [movement_name]):
+            canonical.setdefault(alias, movement_name)
+
+    aliases = list(canonical)
     bind_keys = {f"name{i}": alias for i, alias in enumerate(aliases)}
     in_clause = ", ".join(f":name{i}" for i in range(len(aliases)))
 
+    # The set filter lives in the ON clause so exercises without usable
+    # set rows still come back once (with NULL set columns) for the fallback.
     query = text(f"""
         SELECT
             w.date        AS workout_date,
+            e.id          AS exercise_id,
+            e.name        AS exercise_name,
             e.sets,
             e.reps,
             e.weight,
-            e.set_data
+            s.weight      AS set_weight,
+            s.reps        AS set_reps
         FROM exercise e
         JOIN workout w ON e.workout_id = w.id
+        LEFT JOIN exercise_set s
+               ON s.exercise_id = e.id
+              AND s.completed = 1
+              AND s.weight > 0
+              AND s.reps > 0
         WHERE w.user_id = :user_id
           AND e.name IN ({in_clause})
           AND w.is_draft = 0
-        ORDER BY w.date ASC
+        ORDER BY w.date ASC, e.id ASC, s.set_number ASC
     """)
 
     params = {"user_id": user_id, **bind_keys}
 
-    observed: list[tuple[float, int]] = []
-    workout_dates: set[str] = set()
+    observed: dict[str, list[tuple[float, int]]] = {name: [] for name in movement_names}
+    workout_dates: dict[str, set[str]] = {name: set() for name in movement_names}
 
     with engine.connect() as conn:
         rows = conn.execute(query, params).fetchall()
 
     for row in rows:
-        workout_dates.add(str(row.workout_date)[:10])  # date portion only
+        movement_name = canonical[row.exercise_name]
+        workout_dates[movement_name].add(str(row.workout_date)[:10])  # date portion only
 
+        if row.set_weight is not None:
+            observed[movement_name].append((float(row.set_weight), int(row.set_reps)))
+            continue
+
+        # Fallback: top-level fields — expand sets_count identical sets
         sets_count = row.sets or 1
         reps_top = row.reps or 0
         weight_top = row.weight
-
-        if row.set_data:
-            try:
-                sets_json = json.loads(row.set_data)
-                parsed_any = False
-                for s in sets_json:
-                    w = s.get("weight")
-                    r = s.get("reps", 0) or 0
-                    completed = s.get("completed", True)  # absent → True (legacy)
-                    if w and w > 0 and r > 0 and completed:
-                        observed.append((float(w), int(r)))
-                        parsed_any = True
-                if parsed_any:
-                    continue  # set_data took precedence; skip top-level fallback
-            except (json.JSONDecodeError, TypeError, AttributeError):
-                pass  # fall through to top-level fields
-
-        # Fallback: top-level fields — expand sets_count identical sets
         if weight_top and weight_top > 0 and reps_top > 0:
             for _ in range(sets_count):
-                observed.append((float(weight_top), int(reps_top)))
+                observed[movement_name].append((float(weight_top), int(reps_top)))
 
-    return observed, len(workout_dates)
+    return {name: (observed[name], len(workout_dates[name])) for name in movement_names}
 
 
 # ---------------------------------------------------------------------------
-# PyMC model
+# Model
 # ---------------------------------------------------------------------------
 
-def _run_model(observed_sets: list[tuple[float, int]]) -> tuple:
-    """Fit the Bayesian 1RM model and return (trace, hdi_lower, hdi_upper, posterior_mean).
+HDI_PROB = 0.94
+
+
+def _run_model(observed_sets: list[tuple[float, int]], precise: bool = False) -> dict:
+    """Fit the Bayesian 1RM model and summarise the one_rm posterior.
 
     Prior is anchored at the Epley estimate of the first (chronologically earliest) set.
-    sigma prior = 15% of prior mean, reflecting expected variation in Epley readings.
+    one_rm prior sd = 15% of prior mean, reflecting expected variation in Epley readings.
 
-    Returns: (trace, hdi_lower, hdi_upper, posterior_mean)
+    precise=False uses the grid engine; precise=True runs NUTS.
+
+    Returns: {"posterior_mean", "posterior_sd", "hdi_lower", "hdi_upper", "hdi_prob",
+              "method", "stats"} — stats holds the sufficient statistics
+              (n, ybar, S, mu0) that POST /1rm/update folds new sets into.
     """
     first_weight, first_reps = observed_sets[0]
     mu_prior = epley(first_weight, first_reps)
     epley_vals = np.array([epley(w, r) for w, r in observed_sets])
+    stats = _stats_entry(sufficient_stats(epley_vals), mu_prior)
+
+    if precise:
+        return {**_fit_nuts(epley_vals, mu_prior), "method": "nuts", "stats": stats}
+    return {**grid_posterior(epley_vals, mu_prior, HDI_PROB), "method": "grid", "stats": stats}
+
+
+def _run_model_batch(observed_by_movement: dict[str, list[tuple[float, int]]]) -> dict[str, dict]:
+    """_run_model (grid engine) for several movements in one vectorized pass.
+
+    Returns {movement_name: summary} with the same keys as _run_model.
+    """
+    names = list(observed_by_movement)
+    epley_sets = [[epley(w, r) for w, r in observed_by_movement[name]] for name in names]
+    mu_priors = [vals[0] for vals in epley_sets]
+    summaries = grid_posterior_batch(epley_sets, mu_priors, HDI_PROB)
+    return {
+        name: {
+            **summary,
+            "method": "grid",
+            "stats": _stats_entry(sufficient_stats(vals), mu0),
+        }
+        for name, summary, vals, mu0 in zip(names, summaries, epley_sets, mu_priors)
+    }
+
+
+def _stats_entry(stats: tuple[int, float, float], mu0: float) -> dict:
+    n, ybar, S = stats
+    return {"n": int(n), "ybar": float(ybar), "S": float(S), "mu0": float(mu0)}
+
+
+def _fit_nuts(epley_vals: np.ndarray, mu_prior: float) -> dict:
+    """Sample the model with PyMC NUTS and reduce the trace to a summary.
+
+    The trace is reduced to a few floats here, once, and then discarded —
+    only the summary is cached.
+    """
+    import arviz as az
+    import pymc as pm
 
     with pm.Model():
-        one_rm = pm.Normal("one_rm", mu=mu_prior, sigma=mu_prior * 0.15)
-        sigma = pm.HalfNormal("sigma", sigma=10)
+        one_rm = pm.Normal("one_rm", mu=mu_prior, sigma=mu_prior * PRIOR_SD_FRACTION)
+        sigma = pm.HalfNormal("sigma", sigma=HALF_NORMAL_SCALE)
         pm.Normal("obs", mu=one_rm, sigma=sigma, observed=epley_vals)
         trace = pm.sample(
             1000,
@@ -191,26 +278,137 @@ def _run_model(observed_sets: list[tuple[float, int]]) -> tuple:
             discard_tuned_samples=True,
         )
 
-    hdi_result = az.hdi(trace, hdi_prob=0.94)
-    hdi_lower = float(hdi_result["one_rm"].values[0])
-    hdi_upper = float(hdi_result["one_rm"].values[1])
-    posterior_mean = float(trace.posterior["one_rm"].values.mean())
+    hdi_result = az.hdi(trace, hdi_prob=HDI_PROB)
+    samples = trace.posterior["one_rm"].values
 
-    return trace, hdi_lower, hdi_upper, posterior_mean
+    return {
+        "posterior_mean": float(samples.mean()),
+        "posterior_sd":   float(samples.std()),
+        "hdi_lower":      float(hdi_result["one_rm"].values[0]),
+        "hdi_upper":      float(hdi_result["one_rm"].values[1]),
+        "hdi_prob":       HDI_PROB,
+    }
+
+
+def _summary_response(movement_name: str, entry: dict) -> dict:
+    """GET /1rm response body from a cached summary entry."""
+    n_sessions = entry["n_sessions"]
+    uncertainty_note = (
+        f"Wide interval — only {n_sessions} logged sessions" if n_sessions < 6 else None
+    )
+    return {
+        "movement":         movement_name,
+        "posterior_mean":   round(entry["posterior_mean"], 1),
+        "hdi_lower":        round(entry["hdi_lower"], 1),
+        "hdi_upper":        round(entry["hdi_upper"], 1),
+        "hdi_probability":  entry["hdi_prob"],
+        "method":           entry.get("method", "nuts"),
+        "stale":            entry.get("stale", False),
+        "n_observations":   n_sessions,
+        "last_updated":     entry["last_updated"],
+        "uncertainty_note": uncertainty_note,
+    }
+
+
+def _is_current(entry: dict, data_version: int | None) -> bool:
+    """True if entry was fitted on the user's current data."""
+    return not entry.get("stale") and entry.get("data_version") == data_version
 
 
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
 
+@router.get("/1rm")
+def get_1rm_many(user_id: int = Query(...), movements: str = Query("all")):
+    """GET /api/ml/bayesian/1rm?user_id={int}&movements=all
+
+    Every tracked movement in one request: one DB query over all aliases
+    and one vectorized grid fit for whatever is not already cached.
+
+    movements: "all" (default) or a comma-separated list of URL slugs.
+
+    Response (always 200 unless a slug is unknown):
+        {"results": {slug: <GET /1rm/{movement} body>}, "errors": {slug: {...}}}
+
+    Out-of-date grid summaries are refitted inline along with the misses.
+    An out-of-date NUTS summary is returned with "refitting": true while it
+    is refitted in the background, as the single-movement endpoint would
+    with a 202. Movements with no logged sets are reported under "errors"
+    as insufficient_data.
+    """
+    if movements == "all":
+        slugs = list(MOVEMENT_MAP)
+    else:
+        slugs = [slug.strip() for slug in movements.split(",") if slug.strip()]
+        unknown = [slug for slug in slugs if slug not in MOVEMENT_MAP]
+        if unknown:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "unknown_movement", "message": f"Unknown movement: {', '.join(unknown)}"},
+            )
+
+    data_version = fetch_data_version(engine, user_id)
+    results: dict[str, dict] = {}
+    errors: dict[str, dict] = {}
+    missing: list[str] = []
+
+    for slug in slugs:
+        movement_name = MOVEMENT_MAP[slug]
+        cached = get_cached_summary(user_id, movement_name)
+        if cached is not None and _is_current(cached, data_version):
+            results[slug] = _summary_response(movement_name, cached)
+        elif cached is not None and cached.get("method") == "nuts":
+            enqueue_fit(user_id, movement_name, precise=True)
+            results[slug] = {**_summary_response(movement_name, cached), "stale": True, "refitting": True}
+        else:
+            missing.append(slug)
+
+    if missing:
+        fetched = _fetch_sets_many(user_id, [MOVEMENT_MAP[slug] for slug in missing])
+        to_fit = {name: sets for name, (sets, _) in fetched.items() if sets}
+        summaries = _run_model_batch(to_fit) if to_fit else {}
+
+        for slug in missing:
+            movement_name = MOVEMENT_MAP[slug]
+            if movement_name not in summaries:
+                errors[slug] = {
+                    "error":    "insufficient_data",
+                    "message":  f"No logged sets found for {movement_name}",
+                    "movement": movement_name,
+                }
+                continue
+            entry = set_cached_summary(
+                user_id, movement_name, summaries[movement_name], fetched[movement_name][1],
+                data_version=data_version,
+            )
+            results[slug] = _summary_response(movement_name, entry)
+
+    return {"results": results, "errors": errors}
+
+
 @router.get("/1rm/{movement}")
-def get_1rm(movement: str, user_id: int = Query(...)):
-    """GET /api/ml/bayesian/1rm/{movement}?user_id={int}
+def get_1rm(movement: str, user_id: int = Query(...), precise: bool = Query(False)):
+    """GET /api/ml/bayesian/1rm/{movement}?user_id={int}[&precise=true]
 
     Returns the 94% HDI credible interval for the user's estimated 1RM.
-    Results are cached in-process until invalidated by POST /1rm/update.
+    Posterior summaries are cached (in memory and on disk) and stamped with
+    the user's training_data_version; a summary is current while the stamp
+    matches.
+
+      200 — current summary
+      202 — the last known summary (stale=true if the data has changed
+            since), with a background refit in progress; poll again
+      422 — no logged sets
+
+    With nothing current cached, the grid engine runs inline (milliseconds),
+    so a request never waits on MCMC; only an out-of-date NUTS summary is
+    refitted in the background.
 
     movement: URL slug (e.g. "back-squat", "bench-press")
+    precise:  fit with NUTS instead of the grid engine. A cached NUTS result
+              also serves normal requests; a cached grid result is answered
+              with 202 while NUTS runs in the background.
     """
     movement_name = MOVEMENT_MAP.get(movement)
     if movement_name is None:
@@ -219,34 +417,24 @@ def get_1rm(movement: str, user_id: int = Query(...)):
             content={"error": "unknown_movement", "message": f"Unknown movement: {movement}"},
         )
 
-    # Cache hit — re-extract HDI from stored trace (microseconds)
-    cached = get_cached_trace(user_id, movement_name)
+    data_version = fetch_data_version(engine, user_id)
+    cached = get_cached_summary(user_id, movement_name)
     if cached is not None:
-        trace = cached["trace"]
-        n_sessions = cached["n_sessions"]
-        last_updated = cached["last_updated"]
-
-        hdi_result = az.hdi(trace, hdi_prob=0.94)
-        hdi_lower = float(hdi_result["one_rm"].values[0])
-        hdi_upper = float(hdi_result["one_rm"].values[1])
-        posterior_mean = float(trace.posterior["one_rm"].values.mean())
-
-        uncertainty_note = (
-            f"Wide interval — only {n_sessions} logged sessions" if n_sessions < 6 else None
-        )
-
-        return JSONResponse(content={
-            "movement":         movement_name,
-            "posterior_mean":   round(posterior_mean, 1),
-            "hdi_lower":        round(hdi_lower, 1),
-            "hdi_upper":        round(hdi_upper, 1),
-            "hdi_probability":  0.94,
-            "n_observations":   n_sessions,
-            "last_updated":     last_updated,
-            "uncertainty_note": uncertainty_note,
-        })
-
-    # Cache miss — fetch from DB and run PyMC
+        has_nuts = cached.get("method") == "nuts"
+        current = _is_current(cached, data_version)
+        # Cache hit — summary was computed at fit time
+        if current and (has_nuts or not precise):
+            return JSONResponse(content=_summary_response(movement_name, cached))
+
+        # Out-of-date NUTS, or a precise fit was asked for: refit off the request path
+        if has_nuts or current:
+            enqueue_fit(user_id, movement_name, precise=True)
+            return JSONResponse(
+                status_code=202,
+                content={**_summary_response(movement_name, cached), "stale": not current, "refitting": True},
+            )
+
+    # Cache miss or out-of-date grid summary — fetch from DB and fit with the grid engine
     observed_sets, n_sessions = _fetch_sets(user_id, movement_name)
 
     if not observed_sets:
@@ -259,43 +447,173 @@ def get_1rm(movement: str, user_id: int = Query(...)):
             },
         )
 
-    trace, hdi_lower, hdi_upper, posterior_mean = _run_model(observed_sets)
-    set_cached_trace(user_id, movement_name, trace, n_sessions)
-
-    last_updated = get_cached_trace(user_id, movement_name)["last_updated"]
-    uncertainty_note = (
-        f"Wide interval — only {n_sessions} logged sessions" if n_sessions < 6 else None
+    entry = set_cached_summary(
+        user_id, movement_name, _run_model(observed_sets), n_sessions, data_version=data_version
     )
+    if precise:
+        enqueue_fit(user_id, movement_name, precise=True)
+        return JSONResponse(
+            status_code=202,
+            content={**_summary_response(movement_name, entry), "refitting": True},
+        )
+    return JSONResponse(content=_summary_response(movement_name, entry))
 
-    return JSONResponse(content={
-        "movement":         movement_name,
-        "posterior_mean":   round(posterior_mean, 1),
-        "hdi_lower":        round(hdi_lower, 1),
-        "hdi_upper":        round(hdi_upper, 1),
-        "hdi_probability":  0.94,
-        "n_observations":   n_sessions,
-        "last_updated":     last_updated,
-        "uncertainty_note": uncertainty_note,
-    })
+
+# Incremental updates between full refits. Folding in stats is exact, but the
+# fold only ever adds sets: edits, deletions and backdated workouts, as well
+# as the session count, are only reconciled by a refit over the full history.
+ONE_RM_REFIT_EVERY = int(os.getenv("ONE_RM_REFIT_EVERY", "10"))
+
+_update_lock = threading.Lock()
+
+
+class _SetIn(BaseModel):
+    weight: float
+    reps: int
 
 
 class _UpdateRequest(BaseModel):
     movement: str   # URL slug or canonical name — both handled
     weight: float = 0.0
     reps: int = 0
+    sets: list[_SetIn] = []   # every set of the new workout for this movement
     user_id: int
+    data_version: int | None = None   # users.training_data_version after the write
+
+
+def _fold_in(entry: dict, new_sets: list[tuple[float, int]]) -> dict:
+    """Posterior summary for entry's data plus new_sets, from stats alone.
+
+    The stored sufficient stats play the role of the prior state; only the
+    new Epley values are read. Always a grid-engine summary.
+    """
+    stats = entry["stats"]
+    merged = combine_stats(
+        (stats["n"], stats["ybar"], stats["S"]),
+        sufficient_stats([epley(w, r) for w, r in new_sets]),
+    )
+    return {
+        **grid_posterior_from_stats(*merged, stats["mu0"], HDI_PROB),
+        "method": "grid",
+        "stats": _stats_entry(merged, stats["mu0"]),
+        "updates_since_refit": entry.get("updates_since_refit", 0) + 1,
+    }
+
+
+def _apply_update(
+    user_id: int,
+    movement_name: str,
+    new_sets: list[tuple[float, int]] | None,
+    data_version: int | None,
+) -> dict:
+    """Bring the cached summary for (user_id, movement_name) up to data_version.
+
+    new_sets are the sets of this movement added by the write (an empty
+    list when the write did not touch it); None means they are unknown.
+    """
+    with _update_lock:
+        entry = get_cached_summary(user_id, movement_name)
+        if entry is None or (data_version is not None and _is_current(entry, data_version)):
+            return {"updated": True, "incremental": False, "refit_queued": False}
+
+        precise = entry.get("method") == "nuts"
+        fitting = is_fitting(user_id, movement_name)
+        follows = data_version is None or entry.get("data_version") == data_version - 1
+        can_fold = (
+            new_sets is not None
+            and follows
+            and "stats" in entry
+            and not entry.get("stale")
+            and not fitting
+            and entry.get("updates_since_refit", 0) < ONE_RM_REFIT_EVERY
+        )
+        if can_fold and not new_sets:
+            # Nothing logged for this movement — the summary is still exact
+            set_cached_summary(
+                user_id, movement_name, entry, entry["n_sessions"],
+                data_version=entry.get("data_version") if data_version is None else data_version,
+            )
+            return {"updated": True, "incremental": True, "refit_queued": False}
+        if can_fold:
+            set_cached_summary(
+                user_id, movement_name, _fold_in(entry, new_sets), entry["n_sessions"] + 1,
+                data_version=entry.get("data_version") if data_version is None else data_version,
+            )
+            if precise:
+                enqueue_fit(user_id, movement_name, precise=True, data_changed=True)
+            return {"updated": True, "incremental": True, "refit_queued": precise}
+
+        mark_stale(user_id, movement_name)
+    refit = precise or fitting
+    if refit:
+        enqueue_fit(user_id, movement_name, precise=precise, data_changed=True)
+    return {"updated": True, "incremental": False, "refit_queued": refit}
+
+
+def _valid_sets(sets) -> list[tuple[float, int]]:
+    return [(s.weight, s.reps) for s in sets if s.weight > 0 and s.reps > 0]
 
 
 @router.post("/1rm/update")
 def update_1rm(body: _UpdateRequest):
     """POST /api/ml/bayesian/1rm/update
 
-    Invalidates the cached trace for (user_id, movement) so the next GET
-    re-samples from the updated dataset. Lazy evaluation — does not run
-    the model itself.
+    Called after a workout with this movement is saved, with the user's
+    new training_data_version. When the new sets are sent (sets, or a
+    single weight/reps pair), the cached summary carries sufficient stats
+    and its stamp is exactly one version behind, the sets are folded into
+    it in place and it is restamped — O(new sets), no DB read, no refit.
+    A NUTS summary updated this way is served as a grid result while a
+    precise refit runs in the background.
+
+    Otherwise — no sets sent, a version gap (another write in between),
+    no stats stored, a refit already running, or ONE_RM_REFIT_EVERY
+    incremental updates since the last full fit — the summary is marked
+    stale. The next GET refits a grid summary inline; a NUTS summary is
+    refitted in the background right away. Nothing happens when the
+    movement has never been fitted, or when a refit has already read this
+    version — the next GET fits it.
+
+    This call is an optimisation only: if it never arrives, GET sees the
+    version mismatch and refits the same way.
 
     movement accepts either a URL slug ("bench-press") or canonical name.
     """
     movement_name = MOVEMENT_MAP.get(body.movement, body.movement)
-    invalidate(body.user_id, movement_name)
-    return {"updated": True}
+    new_sets = _valid_sets(body.sets)
+    if body.weight > 0 and body.reps > 0:
+        new_sets.append((body.weight, body.reps))
+    return _apply_update(body.user_id, movement_name, new_sets or None, body.data_version)
+
+
+class _WriteUpdate(BaseModel):
+    data_version: int
+    # slug → sets the write added; tracked movements it did not touch map to []
+    movements: dict[str, list[_SetIn]]
+
+
+class _BatchUpdateRequest(BaseModel):
+    user_id: int
+    updates: list[_WriteUpdate]   # oldest write first
+
+
+@router.post("/1rm/update:batch")
+def update_1rm_batch(body: _BatchUpdateRequest):
+    """POST /api/ml/bayesian/1rm/update:batch
+
+    Several workout writes for one user in one call, applied in order —
+    the Flask app's background dispatcher sends whatever has queued up.
+    Each write lists every tracked movement: the sets it added, or [] for
+    movements it did not touch, so those summaries are restamped with the
+    new version instead of being refitted.
+
+    Returns {"results": {slug: <POST /1rm/update result for the last write>}}.
+    """
+    results: dict[str, dict] = {}
+    for update in body.updates:
+        for slug, sets in update.movements.items():
+            movement_name = MOVEMENT_MAP.get(slug, slug)
+            results[slug] = _apply_update(
+                body.user_id, movement_name, _valid_sets(sets), update.data_version
+            )
+    return {"results": results}
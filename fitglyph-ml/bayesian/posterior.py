@@ -0,0 +1,168 @@
+"""
+Grid posterior for the Bayesian 1RM model — no MCMC.
+
+Model (identical to the PyMC model in one_rm.py):
+    one_rm ~ Normal(mu0, tau0)          tau0 = 15% of mu0
+    sigma  ~ HalfNormal(10)
+    y_i    ~ Normal(one_rm, sigma)      y_i = Epley estimate of set i
+
+Conditioned on sigma the model is Normal-Normal, so one_rm | sigma, y is
+Normal with closed-form mean and variance. sigma is one-dimensional, so its
+marginal posterior is evaluated on a fixed log-spaced grid:
+
+    v_k     = 1 / (1/tau0² + n/σ_k²)
+    m_k     = v_k · (mu0/tau0² + n·ȳ/σ_k²)
+    log w_k = log HalfNormal(σ_k | 10) + log p(y | σ_k) + log σ_k
+
+where log σ_k is the Jacobian of the log-spaced grid, and the marginal
+likelihood depends on the data only through n, ȳ and S = Σ(y_i − ȳ)²:
+
+    log p(y | σ) = −(n−1)/2 · log(2πσ²) − ½ log n − S/(2σ²)
+                   + log Normal(ȳ | mu0, tau0² + σ²/n)
+
+The one_rm posterior is the mixture Σ w_k · Normal(m_k, v_k). Its mean and
+sd are exact moments of the mixture; the HDI is the shortest interval with
+the requested mass under the mixture density, evaluated on a fine grid.
+Everything is a few NumPy array operations — milliseconds, not seconds.
+
+sigma_posterior broadcasts over movements: given arrays of (n, ȳ, S, mu0)
+it returns one row of (m, v, w) per movement, so grid_posterior_batch fits
+every tracked movement of a user in a single pass over a (movements × grid)
+array.
+
+Because (n, ȳ, S) is all the posterior needs, a fit can be updated with new
+observations by merging their stats into the stored ones (combine_stats) —
+O(new sets), and identical to refitting on the full history up to rounding.
+"""
+
+import numpy as np
+
+# Stamped on every stored summary (caching/store.py); bump when the model,
+# its priors or the summary keys change so old summaries are refitted.
+MODEL_VERSION = "1"
+
+HALF_NORMAL_SCALE = 10.0     # sigma prior, as in the PyMC model
+PRIOR_SD_FRACTION = 0.15     # tau0 = 15% of mu0
+
+# Fixed sigma grid: 0.1 → 250 (kg or lb), ~2% steps. HalfNormal(10) puts
+# negligible mass beyond the top; the floor keeps the posterior proper when
+# every reading is identical (S = 0).
+SIGMA_GRID = np.geomspace(0.1, 250.0, 400)
+
+_THETA_POINTS = 2048         # one_rm grid used for the HDI
+_MIN_WEIGHT = 1e-12          # mixture components below this are ignored for the HDI
+
+
+def sufficient_stats(values) -> tuple[int, float, float]:
+    """(n, ȳ, S) for a sequence of Epley values; S = Σ(y − ȳ)²."""
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if n == 0:
+        return 0, 0.0, 0.0
+    mean = float(y.mean())
+    return n, mean, float(((y - mean) ** 2).sum())
+
+
+def combine_stats(a: tuple[int, float, float], b: tuple[int, float, float]) -> tuple[int, float, float]:
+    """Sufficient stats of the union of two samples, from each sample's (n, ȳ, S).
+
+    Chan et al.'s pairwise update: S gains n_a·n_b/n · (ȳ_a − ȳ_b)² on top of
+    S_a + S_b. Lets a posterior absorb new observations without the old ones.
+    """
+    n_a, mean_a, S_a = a
+    n_b, mean_b, S_b = b
+    n = n_a + n_b
+    if n_a == 0 or n_b == 0:
+        return (n, mean_a, S_a) if n_b == 0 else (n, mean_b, S_b)
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, S_a + S_b + delta * delta * n_a * n_b / n
+
+
+def _log_normal_pdf(x, mean, var):
+    return -0.5 * (np.log(2 * np.pi * var) + (x - mean) ** 2 / var)
+
+
+def sigma_posterior(n, ybar, S, mu0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-sigma conditional posteriors of one_rm and the sigma mixture weights.
+
+    Returns (m, v, w): arrays over SIGMA_GRID with the conditional mean and
+    variance of one_rm, and normalised weights (summing to 1).
+
+    Scalars give arrays of shape (len(SIGMA_GRID),); arrays of shape (M,)
+    give (M, len(SIGMA_GRID)), one row per movement.
+    """
+    n, ybar, S, mu0 = (np.asarray(x, dtype=float)[..., None] for x in (n, ybar, S, mu0))
+    tau2 = (PRIOR_SD_FRACTION * mu0) ** 2
+    sigma2 = SIGMA_GRID ** 2
+
+    v = 1.0 / (1.0 / tau2 + n / sigma2)
+    m = v * (mu0 / tau2 + n * ybar / sigma2)
+
+    log_prior = np.log(2.0) + _log_normal_pdf(SIGMA_GRID, 0.0, HALF_NORMAL_SCALE ** 2)
+    log_lik = (
+        -0.5 * (n - 1) * np.log(2 * np.pi * sigma2)
+        - 0.5 * np.log(n)
+        - S / (2 * sigma2)
+        + _log_normal_pdf(ybar, mu0, tau2 + sigma2 / n)
+    )
+    log_w = log_prior + log_lik + np.log(SIGMA_GRID)
+    w = np.exp(log_w - log_w.max(axis=-1, keepdims=True))
+    return m, v, w / w.sum(axis=-1, keepdims=True)
+
+
+def mixture_summary(m: np.ndarray, v: np.ndarray, w: np.ndarray, hdi_prob: float) -> dict:
+    """Mean, sd and shortest hdi_prob interval of Σ w_k · Normal(m_k, v_k)."""
+    mean = float(np.sum(w * m))
+    sd = float(np.sqrt(max(np.sum(w * (v + m ** 2)) - mean ** 2, 0.0)))
+
+    keep = w > _MIN_WEIGHT
+    m, s, w = m[keep], np.sqrt(v[keep]), w[keep]
+    theta = np.linspace((m - 6 * s).min(), (m + 6 * s).max(), _THETA_POINTS)
+    z = (theta[:, None] - m[None, :]) / s[None, :]
+    density = (np.exp(-0.5 * z ** 2) * (w / s)[None, :]).sum(axis=1)
+
+    # CDF by the trapezoid rule; then, over candidate lower tail masses q,
+    # the shortest [F⁻¹(q), F⁻¹(q + p)] with the inverse CDF interpolated
+    cdf = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1]) / 2 * np.diff(theta))])
+    cdf /= cdf[-1]
+    q = np.linspace(0.0, 1.0 - hdi_prob, _THETA_POINTS)
+    lower = np.interp(q, cdf, theta)
+    upper = np.interp(q + hdi_prob, cdf, theta)
+    best = int(np.argmin(upper - lower))
+
+    return {
+        "posterior_mean": mean,
+        "posterior_sd":   sd,
+        "hdi_lower":      float(lower[best]),
+        "hdi_upper":      float(upper[best]),
+        "hdi_prob":       hdi_prob,
+    }
+
+
+def grid_posterior(epley_vals, mu0: float, hdi_prob: float) -> dict:
+    """Posterior summary of one_rm for a set of Epley values and prior mean mu0.
+
+    Same keys as the NUTS summary: posterior_mean, posterior_sd, hdi_lower,
+    hdi_upper, hdi_prob.
+    """
+    return grid_posterior_from_stats(*sufficient_stats(epley_vals), mu0, hdi_prob)
+
+
+def grid_posterior_from_stats(n: int, ybar: float, S: float, mu0: float, hdi_prob: float) -> dict:
+    """grid_posterior from the sufficient stats (n, ȳ, S) of the Epley values."""
+    m, v, w = sigma_posterior(n, ybar, S, mu0)
+    return mixture_summary(m, v, w, hdi_prob)
+
+
+def grid_posterior_batch(epley_sets: list, mu0s, hdi_prob: float) -> list[dict]:
+    """grid_posterior for several movements at once.
+
+    epley_sets[i] holds the Epley values of movement i and mu0s[i] its prior
+    mean. The sigma-grid posteriors of all movements are computed together
+    as one (M × grid) array; only the HDI search runs per movement.
+    """
+    if not epley_sets:
+        return []
+    n, ybar, S = (np.array(col) for col in zip(*(sufficient_stats(vals) for vals in epley_sets)))
+    m, v, w = sigma_posterior(n, ybar, S, np.asarray(mu0s, dtype=float))
+    return [mixture_summary(m[i], v[i], w[i], hdi_prob) for i in range(len(epley_sets))]
@@ -0,0 +1,135 @@
+"""
+Background fitting worker for the Bayesian 1RM model.
+
+Fits run in a process pool (ONE_RM_WORKERS processes, default 1) so a NUTS
+sample never pins the request thread or the event loop. Jobs are coalesced
+per (user_id, movement): while a fit for a key is in flight, further
+requests for it attach to that job instead of sampling again.
+
+If the data changes while a fit is running (POST /1rm/update), the job is
+flagged and re-run once it finishes — its result is stored as stale in the
+meantime, so readers always have the latest summary available.
+
+Finished fits write straight into bayesian.cache, which GET /1rm reads.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+ONE_RM_WORKERS = int(os.getenv("ONE_RM_WORKERS", "1"))
+
+_executor: ProcessPoolExecutor | None = None
+
+# (user_id, movement) → {"precise": bool, "rerun": bool}
+_inflight: dict[tuple[int, str], dict] = {}
+_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the process pool, creating it on first use.
+
+    Uses the spawn start method: forking a process that already runs
+    threads (uvicorn, SQLite connections) is unsafe.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=ONE_RM_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def is_fitting(user_id: int, movement: str) -> bool:
+    """True while a fit for (user_id, movement) is queued or running."""
+    with _lock:
+        return (user_id, movement) in _inflight
+
+
+def enqueue_fit(user_id: int, movement: str, precise: bool = False, data_changed: bool = False) -> bool:
+    """Queue a background fit for (user_id, movement).
+
+    Coalesces with an in-flight fit for the same key. That fit is re-run
+    after it finishes when data_changed is set (it read outdated sets) or
+    when a precise fit is requested and the running one is not.
+
+    Returns True if a new job was started, False if it was coalesced.
+    """
+    key = (user_id, movement)
+    with _lock:
+        job = _inflight.get(key)
+        if job is not None:
+            if data_changed or (precise and not job["precise"]):
+                job["rerun"] = True
+            job["precise"] = job["precise"] or precise
+            return False
+        job = {"precise": precise, "rerun": False}
+        _inflight[key] = job
+    _start(key, job)
+    return True
+
+
+def _start(key: tuple[int, str], job: dict) -> None:
+    """Read the current sets for key and hand the fit to the process pool."""
+    from bayesian.cache import invalidate
+    from bayesian.one_rm import _fetch_sets, _run_model, engine
+    from caching.versions import fetch_data_version
+
+    try:
+        # Version first: a write landing after it leaves the result stamped old
+        data_version = fetch_data_version(engine, key[0])
+        observed_sets, n_sessions = _fetch_sets(*key)
+        if not observed_sets:
+            raise LookupError("no logged sets")
+        future = _get_executor().submit(_run_model, observed_sets, job["precise"])
+    except Exception as exc:
+        print(f"[1rm-worker] Could not start fit for {key}: {exc}")
+        if isinstance(exc, LookupError):
+            # Sets were deleted: drop the old summary so GET answers 422
+            # instead of serving it and queueing this fit again
+            invalidate(*key)
+        with _lock:
+            _inflight.pop(key, None)
+        return
+    future.add_done_callback(lambda f: _finish(key, job, n_sessions, data_version, f))
+
+
+def _finish(
+    key: tuple[int, str], job: dict, n_sessions: int, data_version: int | None, future: Future
+) -> None:
+    """Store a finished fit, then re-run the job if it was flagged meanwhile.
+
+    The job stays in _inflight until the result is stored, so a GET in
+    between sees the fit as running rather than queueing a duplicate.
+    """
+    from bayesian.cache import set_cached_summary
+
+    with _lock:
+        rerun = job["rerun"]
+
+    try:
+        set_cached_summary(*key, future.result(), n_sessions, stale=rerun, data_version=data_version)
+    except Exception as exc:
+        print(f"[1rm-worker] Fit failed for {key}: {exc}")
+
+    with _lock:
+        # Also catch a rerun flagged while the result was being stored
+        rerun = rerun or job["rerun"]
+        job["rerun"] = False
+        if not rerun:
+            _inflight.pop(key, None)
+
+    if rerun:
+        _start(key, job)
+
+
+def shutdown() -> None:
+    """Stop the process pool (called from the app lifespan on shutdown)."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,332 @@
+"""
+Bounded, thread-safe cache backends shared by the ML engines.
+
+Every engine asks for a named cache via get_cache(namespace, ...) instead of
+keeping its own module dict. The backend is chosen once per process from the
+environment:
+
+  ML_CACHE_BACKEND   memory (default) | sqlite
+  ML_CACHE_MAX_MB    byte budget per namespace (default 32)
+  ML_CACHE_PATH      SQLite file for the sqlite backend
+                     (default: fitglyph-ml/cache.sqlite3)
+
+memory — in-process LRU. Entries are evicted least-recently-used first once
+         the namespace's byte budget is exceeded, and lazily when their TTL
+         has passed. Fast, but private to one uvicorn worker.
+
+sqlite — one table in a local SQLite file (WAL mode), so every uvicorn worker
+         on the machine shares the same entries. Same LRU-by-bytes and TTL
+         rules, enforced in SQL. Values must be picklable.
+
+Sizes are measured as the pickled size of the value, computed once on set.
+Each cache keeps hit / miss / set / eviction / expiration counters for this
+process, exposed through stats() and GET /cache/stats.
+"""
+
+import os
+import pathlib
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_THIS_DIR = pathlib.Path(__file__).parent
+
+CACHE_BACKEND = os.getenv("ML_CACHE_BACKEND", "memory").lower()
+CACHE_MAX_BYTES = int(float(os.getenv("ML_CACHE_MAX_MB", "32")) * 1024 * 1024)
+CACHE_PATH = os.getenv(
+    "ML_CACHE_PATH",
+    str(_THIS_DIR.parent / "cache.sqlite3"),
+)
+
+
+def _sizeof(value) -> int:
+    """Approximate memory footprint: pickled size, or getsizeof if unpicklable."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class _Stats:
+    """Per-process counters for one cache namespace."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class MemoryLRUCache:
+    """In-process LRU cache bounded by total (pickled) size, with optional TTL.
+
+    Args:
+        namespace:   Name reported in stats().
+        max_bytes:   Byte budget; least-recently-used entries are evicted
+                     until the total fits. A single value larger than the
+                     budget is not stored.
+        default_ttl: Seconds until an entry expires, or None for no expiry.
+    """
+
+    def __init__(self, namespace: str, max_bytes: int = CACHE_MAX_BYTES, default_ttl: float | None = None):
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict = OrderedDict()   # key → (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = None) -> None:
+        size = _sizeof(value)
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._stats.sets += 1
+            if size > self.max_bytes:
+                self._stats.evictions += 1
+                return
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats.evictions += 1
+
+    def delete(self, key) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._stats.as_dict(),
+            }
+
+    def _remove(self, key) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class SQLiteCache:
+    """Cache stored in a local SQLite file, shared by all worker processes.
+
+    Same contract as MemoryLRUCache. Keys are stored as repr(key), so they
+    must be ints, strings or tuples of those.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        path: str = CACHE_PATH,
+        max_bytes: int = CACHE_MAX_BYTES,
+        default_ttl: float | None = None,
+    ):
+        self.namespace = namespace
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entry (
+                namespace   TEXT    NOT NULL,
+                key         TEXT    NOT NULL,
+                value       BLOB    NOT NULL,
+                size        INTEGER NOT NULL,
+                expires_at  REAL,
+                accessed_at REAL    NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entry_lru ON cache_entry (namespace, accessed_at)"
+        )
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entry WHERE namespace = ? AND key = ?",
+                (self.namespace, repr(key)),
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return default
+            blob, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(
+                    "DELETE FROM cache_entry WHERE namespace = ? AND key = ?",
+                    (self.namespace, repr(key)),
+                )
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._conn.execute(
+                "UPDATE cache_entry SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, repr(key)),
+            )
+            self._stats.hits += 1
+        return pickle.loads(blob)
+
+    def set(self, key, value, ttl: float | None = None) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._stats.sets += 1
+            if len(blob) > self.max_bytes:
+                self._conn.execute(
+                    "DELETE FROM cache_entry WHERE namespace = ? AND key = ?",
+                    (self.namespace, repr(key)),
+                )
+                self._stats.evictions += 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entry VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.namespace, repr(key), blob, len(blob), expires_at, now),
+                )
+                self._evict_over_budget()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entry WHERE namespace = ? AND key = ?",
+                (self.namespace, repr(key)),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entry WHERE namespace = ?", (self.namespace,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+        return {
+            "namespace": self.namespace,
+            "backend": "sqlite",
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            **self._stats.as_dict(),
+        }
+
+    def _evict_over_budget(self) -> None:
+        """Drop expired entries, then least-recently-used ones until within budget."""
+        expired = self._conn.execute(
+            "DELETE FROM cache_entry WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (self.namespace, time.time()),
+        ).rowcount
+        self._stats.expirations += max(expired, 0)
+
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entry WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM cache_entry WHERE namespace = ? ORDER BY accessed_at ASC",
+            (self.namespace,),
+        ).fetchall():
+            self._conn.execute(
+                "DELETE FROM cache_entry WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._stats.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+_caches: dict[str, MemoryLRUCache | SQLiteCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(
+    namespace: str,
+    default_ttl: float | None = None,
+    max_bytes: int | None = None,
+) -> MemoryLRUCache | SQLiteCache:
+    """Return the process-wide cache for `namespace`, creating it on first use.
+
+    The backend comes from ML_CACHE_BACKEND; max_bytes defaults to
+    ML_CACHE_MAX_MB. Arguments are only applied on first creation.
+    """
+    with _registry_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            budget = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+            if CACHE_BACKEND == "sqlite":
+                cache = SQLiteCache(namespace, max_bytes=budget, default_ttl=default_ttl)
+            else:
+                cache = MemoryLRUCache(namespace, max_bytes=budget, default_ttl=default_ttl)
+            _caches[namespace] = cache
+        return cache
+
+
+def all_stats() -> list[dict]:
+    """stats() for every cache created in this process."""
+    with _registry_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
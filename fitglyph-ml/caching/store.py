@@ -0,0 +1,200 @@
+"""
+Persistent result store for the ML engines.
+
+The caches in caching/backends.py are there for speed and may live only in
+memory; this store is there so computed results survive a restart. Fly
+stops idle machines (auto_stop_machines = 'stop', min_machines_running = 0),
+and without it the first request for every user after a cold start would
+re-run the fit or the volume-load scan.
+
+One SQLite file (ML_STORE_PATH, WAL mode) holds every engine's results in a
+single table keyed by (namespace, key). Each row is stamped with:
+
+  engine_version  version of the engine / model that produced it; rows from
+                  any other version are never returned and are purged when
+                  the store is opened, so shipping a model change needs no
+                  manual cleanup
+  data_version    caller-supplied stamp of the input data the result was
+                  computed from; get() can require it to match
+  expires_at      optional TTL, as in the caches
+
+At startup the service calls load() on each store and copies the newest
+rows into the engine's hot cache, so a restarted worker answers like a
+warm one.
+
+Point ML_STORE_PATH at persistent storage (e.g. a mounted Fly volume) in
+deployments where the root filesystem is recreated on start.
+"""
+
+import ast
+import os
+import pathlib
+import pickle
+import sqlite3
+import threading
+import time
+
+_THIS_DIR = pathlib.Path(__file__).parent
+
+STORE_PATH = os.getenv(
+    "ML_STORE_PATH",
+    str(_THIS_DIR.parent / "ml_store.sqlite3"),
+)
+# Rows copied into the hot cache per store at startup (newest first)
+STORE_WARM_LIMIT = int(os.getenv("ML_STORE_WARM_LIMIT", "5000"))
+
+
+class ResultStore:
+    """Results of one engine, persisted in the shared SQLite store file.
+
+    Keys are stored as repr(key), so they must be ints, strings or tuples
+    of those (load() turns them back into Python values). Values must be
+    picklable.
+
+    Args:
+        namespace:      Engine name, e.g. "fatigue".
+        engine_version: Stamp of the code that produces the values.
+        path:           SQLite file; defaults to ML_STORE_PATH.
+        default_ttl:    Seconds until a row expires, or None for no expiry.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        engine_version: str,
+        path: str = STORE_PATH,
+        default_ttl: float | None = None,
+    ):
+        self.namespace = namespace
+        self.engine_version = str(engine_version)
+        self.path = path
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS result_store (
+                namespace      TEXT NOT NULL,
+                key            TEXT NOT NULL,
+                value          BLOB NOT NULL,
+                engine_version TEXT NOT NULL,
+                data_version   TEXT,
+                expires_at     REAL,
+                updated_at     REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_result_store_updated ON result_store (namespace, updated_at)"
+        )
+        purged = self._conn.execute(
+            "DELETE FROM result_store WHERE namespace = ? AND engine_version != ?",
+            (self.namespace, self.engine_version),
+        ).rowcount
+        if purged > 0:
+            print(f"[store] {namespace}: dropped {purged} rows from other engine versions")
+        _stores.append(self)
+
+    def get(self, key, data_version=None):
+        """The stored value for key, or None.
+
+        None is also returned for expired rows and, when data_version is
+        given, for rows stamped with a different data version.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT value, data_version, expires_at FROM result_store
+                WHERE namespace = ? AND key = ? AND engine_version = ?
+                """,
+                (self.namespace, repr(key), self.engine_version),
+            ).fetchone()
+        if row is None:
+            return None
+        blob, stored_version, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        if data_version is not None and stored_version != str(data_version):
+            return None
+        return pickle.loads(blob)
+
+    def put(self, key, value, data_version=None, ttl: float | None = None) -> None:
+        """Store value for key, replacing any previous row."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_store VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    repr(key),
+                    blob,
+                    self.engine_version,
+                    None if data_version is None else str(data_version),
+                    now + ttl if ttl is not None else None,
+                    now,
+                ),
+            )
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM result_store WHERE namespace = ? AND key = ?",
+                (self.namespace, repr(key)),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM result_store WHERE namespace = ?", (self.namespace,))
+
+    def load(self, limit: int = STORE_WARM_LIMIT) -> list[tuple]:
+        """Newest `limit` unexpired rows as (key, value, data_version, ttl) tuples.
+
+        ttl is the number of seconds the row has left, or None if it never
+        expires — pass it on to the cache being warmed.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT key, value, data_version, expires_at FROM result_store
+                WHERE namespace = ? AND engine_version = ?
+                  AND (expires_at IS NULL OR expires_at > ?)
+                ORDER BY updated_at DESC
+                LIMIT ?
+                """,
+                (self.namespace, self.engine_version, now, limit),
+            ).fetchall()
+        return [
+            (
+                ast.literal_eval(key),
+                pickle.loads(blob),
+                version,
+                None if expires_at is None else expires_at - now,
+            )
+            for key, blob, version, expires_at in rows
+        ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM result_store WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+        return {
+            "namespace": self.namespace,
+            "engine_version": self.engine_version,
+            "path": self.path,
+            "entries": entries,
+            "bytes": total,
+        }
+
+
+_stores: list[ResultStore] = []
+
+
+def all_stats() -> list[dict]:
+    """stats() for every store opened in this process."""
+    return [store.stats() for store in list(_stores)]
@@ -0,0 +1,37 @@
+"""
+Per-user training data versions, read from the Flask app's users table.
+
+The Flask app increments users.training_data_version on every workout write.
+Engines stamp each cached result with the version it was computed from and
+compare on read: a result is current exactly when the stamps match. One
+primary-key lookup per request replaces explicit invalidation calls, and a
+missed call can no longer leave a stale result behind.
+"""
+
+from sqlalchemy import bindparam, text
+
+_CHUNK = 500   # user ids per IN (...) query (SQLite variable limit)
+
+
+def fetch_data_version(engine, user_id: int) -> int | None:
+    """Current training_data_version for a user, or None if there is no such user."""
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT training_data_version FROM users WHERE id = :user_id"),
+            {"user_id": user_id},
+        ).scalar()
+
+
+def fetch_data_versions(engine, user_ids: list[int]) -> dict[int, int]:
+    """{user_id: training_data_version} for many users; unknown ids are omitted."""
+    query = text(
+        "SELECT id, training_data_version FROM users WHERE id IN :user_ids"
+    ).bindparams(bindparam("user_ids", expanding=True))
+
+    versions: dict[int, int] = {}
+    with engine.connect() as conn:
+        for i in range(0, len(user_ids), _CHUNK):
+            chunk = user_ids[i:i + _CHUNK]
+            for user_id, version in conn.execute(query, {"user_ids": chunk}):
+                versions[user_id] = version
+    return versions
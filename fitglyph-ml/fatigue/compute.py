@@ -4,6 +4,14 @@ ACWR + Fatigue Engine.
 Computes Acute:Chronic Workload Ratio, training monotony, and strain
 from the user's workout log in the Flask app's SQLite database.
 
+Daily volume load is read from the daily_training_load rollup the Flask app
+maintains on every workout write (one row per user per local day). Each
+rollup row also stores the acute/chronic EWMA as of that day, so /status
+reads the latest row (plus the last 7 days for monotony) and /history reads
+only the requested window — neither depends on the length of the user's
+history. Users whose rollup has not been backfilled yet fall back to
+aggregating the raw workout tables and running the EWMA over the full series.
+
 Math (from ML_FEATURES.md):
   Volume Load per session : VL = Σ(sets × reps × weight) — bodyweight excluded
   Acute Load              : EWMA(VL, span=7,  adjust=False)  — ~7-day decay
@@ -16,6 +24,11 @@ adjust=False uses the recursive EWMA formula (λ = 1 − 2/(span+1)), which
 matches the sports science definition in the spec. pandas defaults to
 adjust=True, which gives different results on short series.
 
+The series math runs on plain NumPy arrays (a contiguous daily VL array plus
+its start date) rather than pandas Series; _ewma() reproduces pandas'
+ewm(span, adjust=False).mean() recurrence operation for operation, so results
+are bit-identical to the previous pandas implementation.
+
 ACWR zones:
   < 0.8          → "undertrained"
   0.8 – 1.3      → "optimal"
@@ -27,18 +40,19 @@ Cold start:
   days_of_data < 28 → HTTP 200 with "warning" field (EWMA less reliable)
 """
 
-import json
 import os
-from collections import defaultdict
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta
 
-import pandas as pd
+import numpy as np
 from dotenv import load_dotenv
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from sqlalchemy import create_engine, text
+from pydantic import BaseModel, Field
+from sqlalchemy import bindparam, create_engine, text
 
+from caching.backends import get_cache
+from caching.store import STORE_WARM_LIMIT, ResultStore
+from caching.versions import fetch_data_version, fetch_data_versions
 from fatigue.history import format_history_payload
 
 load_dotenv()
@@ -55,16 +69,29 @@ DATABASE_URL = os.getenv(
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 
 # ---------------------------------------------------------------------------
-# In-memory cache
+# Cache
 # ---------------------------------------------------------------------------
 
-# { user_id: {"data": <status payload dict>, "computed_at": datetime (UTC)} }
-_cache: dict[int, dict] = {}
-_CACHE_TTL_HOURS = 24
+# Stamped on stored payloads; bump when the metrics or payload shape change
+_RESULT_VERSION = "1"
+# user_id → (training_data_version, status payload); bounded LRU (see caching/backends.py).
+# No TTL: an entry is current exactly while the user's data version matches.
+_cache = get_cache("fatigue")
+# Same payloads persisted across restarts (see caching/store.py)
+_store = ResultStore("fatigue", engine_version=_RESULT_VERSION)
 
 _MIN_DAYS_HARD = 7    # below this: refuse to compute
 _MIN_DAYS_WARN = 28   # below this: compute but warn
 
+# EWMA spans — training_load.py in the Flask app stores state for the same spans
+_ACUTE_SPAN = 7
+_CHRONIC_SPAN = 28
+_ACUTE_DECAY = 1 - 2 / (_ACUTE_SPAN + 1)
+_CHRONIC_DECAY = 1 - 2 / (_CHRONIC_SPAN + 1)
+
+_BATCH_MAX_USERS = 5000   # per POST /status:batch request
+_BATCH_CHUNK = 500        # user ids per IN (...) query (SQLite variable limit)
+
 router = APIRouter()
 
 # ---------------------------------------------------------------------------
@@ -72,23 +99,40 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 
-def _cache_get(user_id: int) -> dict | None:
+def _cache_get(user_id: int, data_version: int | None) -> dict | None:
+    """Cached status payload, if it was computed from data_version."""
+    if data_version is None:
+        return None
     entry = _cache.get(user_id)
     if entry is None:
-        return None
-    age = datetime.now(timezone.utc) - entry["computed_at"]
-    if age.total_seconds() > _CACHE_TTL_HOURS * 3600:
-        del _cache[user_id]
-        return None
-    return entry["data"]
+        data = _store.get(user_id, data_version=data_version)
+        if data is None:
+            return None
+        entry = (data_version, data)
+        _cache.set(user_id, entry)
+    version, data = entry
+    return data if version == data_version else None
 
 
-def _cache_set(user_id: int, data: dict) -> None:
-    _cache[user_id] = {"data": data, "computed_at": datetime.now(timezone.utc)}
+def _cache_set(user_id: int, data_version: int | None, data: dict) -> None:
+    if data_version is None:
+        return
+    _cache.set(user_id, (data_version, data))
+    _store.put(user_id, data, data_version=data_version)
 
 
 def _cache_invalidate(user_id: int) -> None:
-    _cache.pop(user_id, None)
+    _cache.delete(user_id)
+    _store.delete(user_id)
+
+
+def warm(limit: int = STORE_WARM_LIMIT) -> int:
+    """Copy the newest stored payloads into the hot cache; returns the count."""
+    rows = _store.load(limit)
+    for user_id, data, data_version, _ in rows:
+        if data_version is not None:
+            _cache.set(user_id, (int(data_version), data))
+    return len(rows)
 
 
 # ---------------------------------------------------------------------------
@@ -96,94 +140,179 @@ def _cache_invalidate(user_id: int) -> None:
 # ---------------------------------------------------------------------------
 
 
-def _fetch_raw_rows(user_id: int) -> list[dict]:
+def _fetch_rollup_rows(user_id: int) -> list[dict]:
     """
-    Fetch all completed (non-draft) workouts and their exercises for a user.
+    Fetch the user's daily_training_load rows, oldest day first.
 
-    Uses LEFT JOIN so rest-day workouts (no exercise rows) still appear,
-    contributing a 0-VL day to the EWMA series.
+    Each row is one local day: volume_load is already summed across that
+    day's workouts (rest days contribute 0 but still create a row).
     """
     with engine.connect() as conn:
         result = conn.execute(
             text("""
-                SELECT
-                    w.id          AS workout_id,
-                    w.date        AS workout_date,
-                    w.is_rest_day,
-                    e.id          AS exercise_id,
-                    e.sets,
-                    e.reps,
-                    e.weight,
-                    e.set_data
-                FROM workout w
-                LEFT JOIN exercise e ON e.workout_id = w.id
-                WHERE w.user_id = :user_id
-                  AND w.is_draft = 0
-                ORDER BY w.date ASC
+                SELECT local_date, volume_load
+                FROM daily_training_load
+                WHERE user_id = :user_id
+                ORDER BY local_date ASC
             """),
             {"user_id": user_id},
         )
         return [dict(row._mapping) for row in result]
 
 
-# ---------------------------------------------------------------------------
-# Volume Load computation
-# ---------------------------------------------------------------------------
-
+def _fetch_latest_state(user_id: int, limit: int) -> list[dict]:
+    """
+    Fetch the user's newest `limit` rollup rows (newest first) with EWMA state.
 
-def _vl_from_set_data(set_data_raw: str) -> float | None:
+    Every row also carries first_date, the user's earliest rollup day, so
+    days_of_data is known without reading the rest of the history.
     """
-    Parse set_data JSON and sum reps × weight across all sets.
-    Returns None if set_data is absent, empty, or unparseable.
+    with engine.connect() as conn:
+        result = conn.execute(
+            text("""
+                SELECT
+                    local_date,
+                    volume_load,
+                    acute_load,
+                    chronic_load,
+                    (SELECT MIN(local_date)
+                     FROM daily_training_load
+                     WHERE user_id = :user_id) AS first_date
+                FROM daily_training_load
+                WHERE user_id = :user_id
+                ORDER BY local_date DESC
+                LIMIT :limit
+            """),
+            {"user_id": user_id, "limit": limit},
+        )
+        return [dict(row._mapping) for row in result]
+
+
+def _fetch_latest_state_many(user_ids: list[int], limit: int) -> dict[int, list[dict]]:
     """
-    if not set_data_raw:
-        return None
-    try:
-        sets = json.loads(set_data_raw)
-        if not sets:
-            return None
-        total = 0.0
-        for s in sets:
-            w = s.get("weight")
-            r = s.get("reps", 0) or 0
-            if w and w > 0:
-                total += r * w
-        return total
-    except (json.JSONDecodeError, TypeError, AttributeError):
-        return None
+    Batched _fetch_latest_state(): newest `limit` rollup rows per user.
 
+    One query per chunk of user ids; ROW_NUMBER() picks each user's newest
+    rows and MIN() OVER the partition supplies first_date.
 
-def _compute_workout_vl(exercise_rows: list[dict]) -> float:
+    Returns {user_id: [row, ...] newest first}; users without rollup rows
+    are absent.
     """
-    Compute Volume Load for a single workout from its exercise rows.
+    query = text("""
+        SELECT user_id, local_date, volume_load, acute_load, chronic_load, first_date
+        FROM (
+            SELECT
+                user_id,
+                local_date,
+                volume_load,
+                acute_load,
+                chronic_load,
+                MIN(local_date) OVER (PARTITION BY user_id)                       AS first_date,
+                ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY local_date DESC) AS rn
+            FROM daily_training_load
+            WHERE user_id IN :user_ids
+        ) recent
+        WHERE rn <= :limit
+        ORDER BY user_id, local_date DESC
+    """).bindparams(bindparam("user_ids", expanding=True))
+
+    by_user: dict[int, list[dict]] = {}
+    with engine.connect() as conn:
+        for i in range(0, len(user_ids), _BATCH_CHUNK):
+            result = conn.execute(
+                query, {"user_ids": user_ids[i:i + _BATCH_CHUNK], "limit": limit}
+            )
+            for row in result:
+                by_user.setdefault(row.user_id, []).append(dict(row._mapping))
+    return by_user
 
-    Preference order:
-      1. set_data JSON (per-set reps × weight)
-      2. Top-level sets × reps × weight
 
-    Bodyweight exercises (weight is None or 0) are excluded from VL.
-    Rest-day rows contain NULL exercise columns and contribute 0.
+def _fetch_state_window(user_id: int, start: date) -> tuple[dict | None, list[dict]]:
     """
-    total = 0.0
-    for row in exercise_rows:
-        # Rest day: exercise columns are NULL from LEFT JOIN
-        if row.get("exercise_id") is None:
-            continue
+    Fetch the rollup rows from `start` onward, plus the last row before it.
 
-        # Try set_data first
-        vl = _vl_from_set_data(row.get("set_data"))
-        if vl is not None:
-            total += vl
-            continue
+    The earlier row anchors the EWMA state for any unlogged days at the
+    start of the window.
+    """
+    params = {"user_id": user_id, "start": start.isoformat()}
+    with engine.connect() as conn:
+        anchor = conn.execute(
+            text("""
+                SELECT local_date, volume_load, acute_load, chronic_load
+                FROM daily_training_load
+                WHERE user_id = :user_id AND local_date < :start
+                ORDER BY local_date DESC
+                LIMIT 1
+            """),
+            params,
+        ).first()
+        rows = conn.execute(
+            text("""
+                SELECT local_date, volume_load, acute_load, chronic_load
+                FROM daily_training_load
+                WHERE user_id = :user_id AND local_date >= :start
+                ORDER BY local_date ASC
+            """),
+            params,
+        )
+        return (
+            dict(anchor._mapping) if anchor is not None else None,
+            [dict(row._mapping) for row in rows],
+        )
 
-        # Fallback: top-level fields
-        w = row.get("weight")
-        s = row.get("sets") or 0
-        r = row.get("reps") or 0
-        if w and w > 0:
-            total += s * r * w
 
-    return total
+def _fetch_raw_rows(user_id: int) -> list[dict]:
+    """
+    Fetch per-workout Volume Load for all completed (non-draft) workouts.
+
+    VL is aggregated in SQL, one row per workout:
+      1. exercise_set rows (per-set reps × weight) when the exercise has any
+      2. otherwise the top-level sets × reps × weight columns
+
+    Bodyweight sets/exercises (weight NULL or 0) contribute nothing.
+    LEFT JOINs keep rest-day workouts (no exercise rows) in the result so
+    they still contribute a 0-VL day to the EWMA series. Each row also
+    carries the user's timezone_offset so days can be bucketed locally,
+    as the rollup does.
+    """
+    with engine.connect() as conn:
+        result = conn.execute(
+            text("""
+                SELECT
+                    w.id                       AS workout_id,
+                    w.date                     AS workout_date,
+                    w.is_rest_day,
+                    COALESCE(u.timezone_offset, 0) AS timezone_offset,
+                    COALESCE(SUM(ev.vl), 0)    AS volume_load
+                FROM workout w
+                JOIN users u ON u.id = w.user_id
+                LEFT JOIN (
+                    SELECT
+                        e.workout_id,
+                        CASE
+                            WHEN COUNT(s.id) > 0 THEN
+                                SUM(CASE WHEN s.weight > 0
+                                         THEN COALESCE(s.reps, 0) * s.weight
+                                         ELSE 0 END)
+                            WHEN e.weight > 0 THEN
+                                COALESCE(e.sets, 0) * COALESCE(e.reps, 0) * e.weight
+                            ELSE 0
+                        END AS vl
+                    FROM exercise e
+                    JOIN workout we ON we.id = e.workout_id
+                    LEFT JOIN exercise_set s ON s.exercise_id = e.id
+                    WHERE we.user_id = :user_id
+                      AND we.is_draft = 0
+                    GROUP BY e.id, e.workout_id, e.sets, e.reps, e.weight
+                ) ev ON ev.workout_id = w.id
+                WHERE w.user_id = :user_id
+                  AND w.is_draft = 0
+                GROUP BY w.id, w.date, w.is_rest_day, u.timezone_offset
+                ORDER BY w.date ASC
+            """),
+            {"user_id": user_id},
+        )
+        return [dict(row._mapping) for row in result]
 
 
 # ---------------------------------------------------------------------------
@@ -204,53 +333,127 @@ def _parse_workout_date(raw) -> date:
     return datetime.fromisoformat(str(raw)).date()
 
 
-def _build_daily_vl(rows: list[dict]) -> pd.Series:
+def _local_workout_day(raw, offset_hours: int) -> date:
+    """
+    Local calendar day of a UTC workout timestamp — the same bucketing the
+    Flask app uses for the daily_training_load rollup (training_load.local_day).
     """
-    Aggregate raw SQL rows into a contiguous daily VL Series.
+    if isinstance(raw, datetime):
+        workout_dt = raw
+    elif isinstance(raw, date):
+        workout_dt = datetime(raw.year, raw.month, raw.day)
+    else:
+        workout_dt = datetime.fromisoformat(str(raw))
+    return (workout_dt + timedelta(hours=offset_hours)).date()
 
-    - Groups rows by workout_id → computes VL per workout
-    - Multiple workouts on the same calendar day are summed
-    - Rest-day workouts contribute 0 VL
-    - Missing days between first and last date are 0-filled
 
-    Returns a pd.Series indexed by DatetimeIndex (daily freq), sorted ascending.
-    Returns an empty Series if rows is empty.
+def _sum_workouts_by_day(rows: list[dict]) -> dict[date, float]:
     """
-    if not rows:
-        return pd.Series(dtype=float)
+    Sum per-workout VL rows (from _fetch_raw_rows) into {local date: VL}.
 
-    # Group rows by workout_id; also capture per-workout metadata
-    workout_groups: dict[int, list[dict]] = defaultdict(list)
-    workout_meta: dict[int, dict] = {}
-
-    for row in rows:
-        wid = row["workout_id"]
-        workout_groups[wid].append(row)
-        if wid not in workout_meta:
-            workout_meta[wid] = {
-                "date": row["workout_date"],
-                "is_rest_day": bool(row["is_rest_day"]),
-            }
-
-    # Compute VL per date, summing across multiple workouts on the same day
+    - Workout timestamps are UTC; each is shifted by the row's timezone_offset
+      so days match the rollup
+    - Multiple workouts on the same local day are summed
+    - Rest-day workouts contribute 0 VL
+    """
     daily_vl: dict[date, float] = {}
-    for wid, group_rows in workout_groups.items():
-        meta = workout_meta[wid]
-        workout_date = _parse_workout_date(meta["date"])
-        vl = 0.0 if meta["is_rest_day"] else _compute_workout_vl(group_rows)
+    for row in rows:
+        workout_date = _local_workout_day(row["workout_date"], row.get("timezone_offset") or 0)
+        vl = 0.0 if row["is_rest_day"] else float(row["volume_load"] or 0.0)
         daily_vl[workout_date] = daily_vl.get(workout_date, 0.0) + vl
+    return daily_vl
+
 
+def _fetch_daily_totals(user_id: int) -> dict[date, float]:
+    """
+    {date: VL} for every day the user logged a workout.
+
+    Reads the daily_training_load rollup; falls back to aggregating the raw
+    workout tables when the user has no rollup rows (not yet backfilled).
+    """
+    rollup = _fetch_rollup_rows(user_id)
+    if rollup:
+        return {
+            _parse_workout_date(row["local_date"]): float(row["volume_load"] or 0.0)
+            for row in rollup
+        }
+    return _sum_workouts_by_day(_fetch_raw_rows(user_id))
+
+
+def _build_daily_vl(daily_vl: dict[date, float]) -> tuple[date | None, np.ndarray]:
+    """
+    Expand {date: VL} into a contiguous daily VL array.
+
+    Missing days between first and last date are 0-filled.
+
+    Returns (start_date, values) where values[i] is the VL of start_date + i
+    days. Returns (None, empty array) if daily_vl is empty.
+    """
     if not daily_vl:
-        return pd.Series(dtype=float)
+        return None, np.zeros(0)
+
+    # Scatter each day's VL into its offset from the first day; gaps stay 0
+    # (unlogged days = no training)
+    ordinals = np.fromiter((d.toordinal() for d in daily_vl), dtype=np.int64, count=len(daily_vl))
+    first = int(ordinals.min())
+    series = np.zeros(int(ordinals.max()) - first + 1)
+    series[ordinals - first] = np.fromiter(daily_vl.values(), dtype=float, count=len(daily_vl))
+
+    return date.fromordinal(first), series
+
+
+def _expand_state_window(
+    anchor: dict | None, rows: list[dict], start: date, end: date
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Expand stored rollup state into contiguous daily VL / acute / chronic arrays
+    covering start..end inclusive.
+
+    Logged days take their stored values. Unlogged days have 0 VL and decay
+    the previous day's EWMA by (1 − α), exactly as the recurrence would.
+    `start` must be on or after the user's first logged day.
+    """
+    by_day = {_parse_workout_date(row["local_date"]): row for row in rows}
+    state = None
+    if anchor is not None:
+        # Carry the anchor forward over the unlogged days up to the window start
+        gap = (start - _parse_workout_date(anchor["local_date"])).days - 1
+        state = (
+            float(anchor["acute_load"]) * _ACUTE_DECAY ** gap,
+            float(anchor["chronic_load"]) * _CHRONIC_DECAY ** gap,
+        )
 
-    # Build a contiguous date range; 0-fill gaps (unlogged days = no training)
-    all_dates = sorted(daily_vl.keys())
-    idx = pd.date_range(start=all_dates[0], end=all_dates[-1], freq="D")
-    series = pd.Series(
-        {pd.Timestamp(d): v for d, v in daily_vl.items()}
-    ).reindex(idx, fill_value=0.0)
+    vl, acute, chronic = [], [], []
+    for offset in range((end - start).days + 1):
+        row = by_day.get(start + timedelta(days=offset))
+        if row is not None:
+            vl.append(float(row["volume_load"] or 0.0))
+            state = (float(row["acute_load"]), float(row["chronic_load"]))
+        else:
+            vl.append(0.0)
+            state = (state[0] * _ACUTE_DECAY, state[1] * _CHRONIC_DECAY)
+        acute.append(state[0])
+        chronic.append(state[1])
 
-    return series.sort_index()
+    return np.array(vl), np.array(acute), np.array(chronic)
+
+
+def _recent_vl(latest: list[dict], last_date: date, window: int) -> np.ndarray:
+    """
+    0-filled daily VL for the `window` days ending at last_date, oldest first,
+    from rollup rows (any order; rows outside the window are ignored).
+    """
+    recent = np.zeros(window)
+    for row in latest:
+        offset = (last_date - _parse_workout_date(row["local_date"])).days
+        if offset < window:
+            recent[window - 1 - offset] = float(row["volume_load"] or 0.0)
+    return recent
+
+
+def _has_state(latest: list[dict]) -> bool:
+    """True when the newest rollup row carries EWMA state (rollup is backfilled)."""
+    return bool(latest) and latest[0]["acute_load"] is not None
 
 
 # ---------------------------------------------------------------------------
@@ -268,40 +471,139 @@ def _zone_and_label(acwr: float) -> tuple[str, str]:
     return "high_risk", "Training load is high — reduce intensity"
 
 
-def _compute_metrics(daily_vl: pd.Series) -> dict:
+def _ewma(daily_vl: np.ndarray, span: int) -> np.ndarray:
+    """
+    Full-series EWMA with adjust=False (recursive formula) to match the λ
+    definition in ML_FEATURES.md.
+
+    Mirrors pandas' ewm(span=span, adjust=False).mean() kernel step for step
+    (same α derivation, same normalisation by (1 − α) + α, same skip when the
+    value is unchanged) so the output is bit-identical. The recurrence is
+    inherently sequential; running it over Python floats avoids building a
+    Series per request.
+    """
+    com = (span - 1) / 2.0
+    alpha = 1.0 / (1.0 + com)
+    old_wt = 1.0 - alpha
+
+    out = np.empty(len(daily_vl))
+    if not len(daily_vl):
+        return out
+    values = daily_vl.tolist()
+    weighted = values[0]
+    out[0] = weighted
+    for i in range(1, len(values)):
+        cur = values[i]
+        if weighted != cur:
+            weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        out[i] = weighted
+    return out
+
+
+def _status_inputs(user_id: int) -> tuple[int, float, float, np.ndarray]:
     """
-    Compute ACWR and derived metrics from a contiguous daily VL Series.
+    (days_of_data, acute_load, chronic_load, last_7_vl) for the status route.
 
-    EWMA uses adjust=False (recursive formula) to match the λ definition
-    in ML_FEATURES.md. This differs from pandas' default adjust=True.
+    Reads the stored EWMA state of the newest rollup row and the last 7 days
+    of VL; falls back to computing the EWMA over the full daily series when
+    the rollup has no state yet.
     """
-    acute_series = daily_vl.ewm(span=7, adjust=False).mean()
-    chronic_series = daily_vl.ewm(span=28, adjust=False).mean()
+    latest = _fetch_latest_state(user_id, limit=_ACUTE_SPAN)
+    if _has_state(latest):
+        last_date = _parse_workout_date(latest[0]["local_date"])
+        first_date = _parse_workout_date(latest[0]["first_date"])
+        days_of_data = (last_date - first_date).days + 1
+        # Monotony over the last 7 days (or all days if fewer than 7)
+        last_7 = _recent_vl(latest, last_date, min(_ACUTE_SPAN, days_of_data))
+        return days_of_data, float(latest[0]["acute_load"]), float(latest[0]["chronic_load"]), last_7
+
+    _, daily_vl = _build_daily_vl(_fetch_daily_totals(user_id))
+    if not len(daily_vl):
+        return 0, 0.0, 0.0, daily_vl
+    return (
+        len(daily_vl),
+        float(_ewma(daily_vl, _ACUTE_SPAN)[-1]),
+        float(_ewma(daily_vl, _CHRONIC_SPAN)[-1]),
+        daily_vl[-_ACUTE_SPAN:],
+    )
+
+
+def _history_inputs(
+    user_id: int, days: int
+) -> tuple[int, date | None, np.ndarray | None, np.ndarray | None, np.ndarray | None]:
+    """
+    (days_of_data, window_start, vl_window, acute_window, chronic_window)
+    for the history route.
 
-    acute_load = float(acute_series.iloc[-1])
-    chronic_load = float(chronic_series.iloc[-1])
-    acwr = acute_load / chronic_load if chronic_load > 0 else 0.0
+    With stored state only the requested window (and the row just before it)
+    is read. Otherwise the EWMA is computed on the FULL series and then
+    sliced — slicing first would lose the prior context the exponential
+    weights depend on.
+    """
+    latest = _fetch_latest_state(user_id, limit=1)
+    if _has_state(latest):
+        last_date = _parse_workout_date(latest[0]["local_date"])
+        first_date = _parse_workout_date(latest[0]["first_date"])
+        days_of_data = (last_date - first_date).days + 1
+        if days_of_data < _MIN_DAYS_HARD:
+            return days_of_data, None, None, None, None
+        span = days if 0 < days < days_of_data else days_of_data
+        start = last_date - timedelta(days=span - 1)
+        anchor, rows = _fetch_state_window(user_id, start)
+        return (days_of_data, start, *_expand_state_window(anchor, rows, start, last_date))
+
+    series_start, daily_vl = _build_daily_vl(_fetch_daily_totals(user_id))
+    if len(daily_vl) < _MIN_DAYS_HARD:
+        return len(daily_vl), None, None, None, None
+    full_acute = _ewma(daily_vl, _ACUTE_SPAN)
+    full_chronic = _ewma(daily_vl, _CHRONIC_SPAN)
+    window = daily_vl[-days:]
+    start = series_start + timedelta(days=len(daily_vl) - len(window))
+    return len(daily_vl), start, window, full_acute[-days:], full_chronic[-days:]
+
+
+def _compute_metrics(acute_load: float, chronic_load: float, last_7: np.ndarray) -> dict:
+    """
+    Compute ACWR and derived metrics from the current EWMA state and the
+    daily VL of the last 7 days (or all days if fewer than 7).
+    """
+    return _compute_metrics_batch(
+        np.array([acute_load]), np.array([chronic_load]), last_7[np.newaxis, :]
+    )[0]
 
-    # Monotony over the last 7 days (or all days if fewer than 7)
-    last_7 = daily_vl.iloc[-7:] if len(daily_vl) >= 7 else daily_vl
-    mean_7 = float(last_7.mean())
-    std_7 = float(last_7.std(ddof=1)) if len(last_7) > 1 else 0.0
-    monotony = mean_7 / std_7 if std_7 > 0 else 0.0
 
-    weekly_vl = float(last_7.sum())
-    strain = weekly_vl * monotony
+def _compute_metrics_batch(
+    acute_load: np.ndarray, chronic_load: np.ndarray, last_7: np.ndarray
+) -> list[dict]:
+    """
+    Vectorised _compute_metrics() over many users.
 
-    zone, readiness_label = _zone_and_label(acwr)
+    acute_load / chronic_load have shape (n,); last_7 has shape (n, w) —
+    one row of daily VL per user, w ≤ 7. Returns one metrics dict per user.
+    """
+    n, w = last_7.shape
+    acwr = np.divide(acute_load, chronic_load, out=np.zeros(n), where=chronic_load > 0)
 
-    return {
-        "acwr": round(acwr, 4),
-        "acwr_zone": zone,
-        "acute_load": round(acute_load, 2),
-        "chronic_load": round(chronic_load, 2),
-        "monotony": round(monotony, 4),
-        "strain": round(strain, 2),
-        "readiness_label": readiness_label,
-    }
+    mean_7 = np.mean(last_7, axis=1)
+    std_7 = np.std(last_7, axis=1, ddof=1) if w > 1 else np.zeros(n)
+    monotony = np.divide(mean_7, std_7, out=np.zeros(n), where=std_7 > 0)
+
+    weekly_vl = np.sum(last_7, axis=1)
+    strain = weekly_vl * monotony
+
+    metrics = []
+    for i in range(n):
+        zone, readiness_label = _zone_and_label(float(acwr[i]))
+        metrics.append({
+            "acwr": round(float(acwr[i]), 4),
+            "acwr_zone": zone,
+            "acute_load": round(float(acute_load[i]), 2),
+            "chronic_load": round(float(chronic_load[i]), 2),
+            "monotony": round(float(monotony[i]), 4),
+            "strain": round(float(strain[i]), 2),
+            "readiness_label": readiness_label,
+        })
+    return metrics
 
 
 # ---------------------------------------------------------------------------
@@ -347,25 +649,25 @@ def fatigue_status(user_id: int = Query(...)):
     GET /api/ml/fatigue/status?user_id={int}
 
     Returns the current ACWR, zone classification, acute/chronic loads,
-    monotony, and strain. Cached for 24 hours per user; invalidate via
-    POST /api/ml/fatigue/invalidate after a new workout is logged.
+    monotony, and strain. Cached per user (in memory and in the persistent
+    result store) and stamped with the user's training_data_version; a
+    workout write bumps the version, so the next call recomputes.
     """
-    cached = _cache_get(user_id)
+    data_version = fetch_data_version(engine, user_id)
+    cached = _cache_get(user_id, data_version)
     if cached:
         return JSONResponse(content=cached)
 
-    rows = _fetch_raw_rows(user_id)
-    daily_vl = _build_daily_vl(rows)
-    days_of_data = len(daily_vl)
+    days_of_data, acute_load, chronic_load, last_7 = _status_inputs(user_id)
 
     is_error, error_payload, warning = _cold_start(days_of_data)
     if is_error:
         return JSONResponse(status_code=422, content=error_payload)
 
-    metrics = _compute_metrics(daily_vl)
+    metrics = _compute_metrics(acute_load, chronic_load, last_7)
     payload = {**metrics, "days_of_data": days_of_data, "warning": warning}
 
-    _cache_set(user_id, payload)
+    _cache_set(user_id, data_version, payload)
     return JSONResponse(content=payload)
 
 
@@ -377,27 +679,94 @@ def fatigue_history(user_id: int = Query(...), days: int = Query(default=28)):
     Returns time-series arrays for ACWR, acute load, chronic load, and raw
     volume load over the requested window.
 
-    IMPORTANT: EWMA is always computed on the FULL historical series before
-    slicing to the requested window. Slicing before computing would produce
-    incorrect exponential weights because prior context would be lost.
+    IMPORTANT: the EWMA values in the window always reflect the FULL history
+    (stored per-day state, or a full-series EWMA when no state is stored).
+    Computing EWMA on the window alone would produce incorrect exponential
+    weights because prior context would be lost.
     """
-    rows = _fetch_raw_rows(user_id)
-    daily_vl = _build_daily_vl(rows)
-    days_of_data = len(daily_vl)
+    days_of_data, start, window, acute_window, chronic_window = _history_inputs(user_id, days)
 
     is_error, error_payload, _ = _cold_start(days_of_data)
     if is_error:
         return JSONResponse(status_code=422, content=error_payload)
 
-    # Compute EWMA on full series, then slice — never the other way around
-    full_acute = daily_vl.ewm(span=7, adjust=False).mean()
-    full_chronic = daily_vl.ewm(span=28, adjust=False).mean()
+    return JSONResponse(content=format_history_payload(start, window, acute_window, chronic_window))
+
+
+class _BatchStatusRequest(BaseModel):
+    user_ids: list[int] = Field(..., max_length=_BATCH_MAX_USERS)
+
+
+@router.post("/status:batch")
+def fatigue_status_batch(body: _BatchStatusRequest):
+    """
+    POST /api/ml/fatigue/status:batch
+    Body: { "user_ids": [int, ...] }   (at most 5000)
+
+    Status for many users in one call — for coach dashboards and the nightly
+    refresh. Rollup state for every requested user is read with one query
+    per 500 ids and the metrics are computed in a single vectorised pass.
+
+    Users without rollup rows, or whose rollup has no EWMA state yet
+    (backfill pending), are computed one by one exactly as GET /status
+    would, from the raw workout tables if need be. Fresh results are written to the same
+    per-user cache GET /status reads.
+
+    Returns:
+        {
+          "results": { "<user_id>": <GET /status payload>, ... },
+          "errors":  { "<user_id>": <insufficient_data payload>, ... }
+        }
+    """
+    user_ids = list(dict.fromkeys(body.user_ids))
+    results: dict[str, dict] = {}
+    errors: dict[str, dict] = {}
+
+    versions = fetch_data_versions(engine, user_ids)
+    pending = []
+    for user_id in user_ids:
+        cached = _cache_get(user_id, versions.get(user_id))
+        if cached:
+            results[str(user_id)] = cached
+        else:
+            pending.append(user_id)
+
+    latest_by_user = _fetch_latest_state_many(pending, limit=_ACUTE_SPAN)
+
+    # Users with stored state: gather into arrays for one vectorised pass
+    ready_ids, ready_days, acute, chronic, recent = [], [], [], [], []
+    for user_id in pending:
+        latest = latest_by_user.get(user_id, [])
+        if not _has_state(latest):
+            # No rollup rows, or rows without EWMA state: same fallback as GET /status
+            days_of_data, acute_load, chronic_load, last_7 = _status_inputs(user_id)
+        else:
+            last_date = _parse_workout_date(latest[0]["local_date"])
+            days_of_data = (last_date - _parse_workout_date(latest[0]["first_date"])).days + 1
+            acute_load = float(latest[0]["acute_load"])
+            chronic_load = float(latest[0]["chronic_load"])
+            last_7 = _recent_vl(latest, last_date, min(_ACUTE_SPAN, days_of_data))
+
+        is_error, error_payload, _ = _cold_start(days_of_data)
+        if is_error:
+            errors[str(user_id)] = error_payload
+            continue
+        ready_ids.append(user_id)
+        ready_days.append(days_of_data)
+        acute.append(acute_load)
+        chronic.append(chronic_load)
+        recent.append(last_7)
 
-    window = daily_vl.iloc[-days:]
-    acute_window = full_acute.iloc[-days:]
-    chronic_window = full_chronic.iloc[-days:]
+    if ready_ids:
+        # Past the cold-start guard every user has ≥ 7 days, so rows are full width
+        metrics = _compute_metrics_batch(np.array(acute), np.array(chronic), np.vstack(recent))
+        for user_id, days_of_data, user_metrics in zip(ready_ids, ready_days, metrics):
+            _, _, warning = _cold_start(days_of_data)
+            payload = {**user_metrics, "days_of_data": days_of_data, "warning": warning}
+            _cache_set(user_id, versions.get(user_id), payload)
+            results[str(user_id)] = payload
 
-    return JSONResponse(content=format_history_payload(window, acute_window, chronic_window))
+    return {"results": results, "errors": errors}
 
 
 class _InvalidateRequest(BaseModel):
@@ -410,8 +779,9 @@ def fatigue_invalidate(body: _InvalidateRequest):
     POST /api/ml/fatigue/invalidate
     Body: { "user_id": int }
 
-    Clears the cached status for a user. Call this from the main app
-    whenever a new workout is saved for that user.
+    Clears the cached status for a user. Not needed after workout writes —
+    entries are checked against users.training_data_version on every read —
+    but kept for forcing a recompute by hand.
     """
     _cache_invalidate(body.user_id)
     return {"invalidated": True, "user_id": body.user_id}
@@ -16,8 +16,13 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from caching.backends import all_stats as cache_stats
+from caching.store import all_stats as store_stats
 from fatigue.compute import router as fatigue_router
+from fatigue.compute import warm as warm_fatigue_cache
+from bayesian.cache import warm as warm_1rm_cache
 from bayesian.one_rm import router as bayesian_router
+from bayesian.worker import shutdown as shutdown_1rm_worker
 from rag.query import router as rag_router
 
 load_dotenv()
@@ -28,6 +33,12 @@ _ALLOWED_HOSTS = {"127.0.0.1", "::1", "localhost"}
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Load persisted results into the hot caches so a cold start answers warm
+    try:
+        print(f"[startup] Warmed {warm_fatigue_cache()} fatigue and {warm_1rm_cache()} 1RM results from store")
+    except Exception as exc:
+        print(f"[startup] Cache warm-up skipped: {exc}")
+
     # Auto-ingest corpus on first boot (when ChromaDB collection is empty)
     try:
         from rag.ingest import get_collection, ingest_corpus
@@ -38,6 +49,7 @@ async def lifespan(app: FastAPI):
     except Exception as exc:
         print(f"[startup] RAG ingest skipped: {exc}")
     yield
+    shutdown_1rm_worker()
 
 
 app = FastAPI(title="fitglyph-ml", version="0.1.0", lifespan=lifespan)
@@ -67,6 +79,13 @@ def health():
     return {"status": "ok", "service": "fitglyph-ml", "port": 8001}
 
 
+@app.get("/cache/stats")
+def get_cache_stats():
+    """Size and hit/miss/eviction counters for every engine cache in this worker,
+    plus the size of each persistent result store."""
+    return {"caches": cache_stats(), "stores": store_stats()}
+
+
 app.include_router(fatigue_router, prefix="/api/ml/fatigue")
 app.include_router(bayesian_router, prefix="/api/ml/bayesian")
 app.include_router(rag_router, prefix="/api/ml/rag")
@@ -0,0 +1,91 @@
+"""
+Token-window chunking for the RAG ingest pipeline.
+
+Split out of rag.ingest so the chunking worker processes (spawned, see
+ingest_corpus) import only tiktoken — not chromadb or sentence-transformers,
+which would load torch into every worker.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+import tiktoken
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"   # part of every chunk's content hash
+CHUNK_SIZE      = 400   # tokens
+CHUNK_OVERLAP   = 50    # tokens
+
+_tokenizer = None
+
+
+def _get_tokenizer():
+    """Return the lazy-loaded tiktoken encoder."""
+    global _tokenizer
+    if _tokenizer is None:
+        _tokenizer = tiktoken.get_encoding("cl100k_base")
+    return _tokenizer
+
+
+def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """
+    Split text into overlapping token-window chunks.
+
+    Returns a list of decoded string chunks. Each chunk is at most
+    chunk_size tokens; consecutive chunks share overlap tokens.
+    """
+    enc    = _get_tokenizer()
+    tokens = enc.encode(text)
+
+    if len(tokens) <= chunk_size:
+        return [text]
+
+    chunks: list[str] = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + chunk_size, len(tokens))
+        chunks.append(enc.decode(tokens[start:end]))
+        if end == len(tokens):
+            break
+        start += chunk_size - overlap
+
+    return chunks
+
+
+def _content_hash(chunk: str, metadata: dict) -> str:
+    """Hash of everything an upserted chunk is built from.
+
+    Includes the embedding model and chunking parameters, so changing any of
+    them re-embeds the whole corpus on the next run.
+    """
+    payload = json.dumps(
+        [EMBEDDING_MODEL, CHUNK_SIZE, CHUNK_OVERLAP, chunk, metadata],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _chunk_documents(docs: list[dict]) -> list[tuple[str, str, dict]]:
+    """
+    Chunk and hash a group of validated documents.
+
+    Returns (chunk_id, chunk, metadata) triples; metadata carries the
+    content_hash. Runs in the ingest worker processes.
+    """
+    out: list[tuple[str, str, dict]] = []
+    for doc in docs:
+        # Sanitise metadata: ChromaDB requires all values to be str/int/float/bool,
+        # and None is not allowed — replace None with empty string.
+        clean_meta: dict = {
+            k: (v if v is not None else "")
+            for k, v in (doc.get("metadata") or {}).items()
+        }
+
+        chunks = chunk_text(doc["text"])
+        for i, chunk in enumerate(chunks):
+            chunk_id = f"{doc['id']}_c{i}" if len(chunks) > 1 else doc["id"]
+            meta     = {**clean_meta, "content_hash": _content_hash(chunk, clean_meta)}
+            out.append((chunk_id, chunk, meta))
+    return out
@@ -1,33 +1,49 @@
 """
 RAG corpus ingestion pipeline.
 
-Loads documents from rag/corpus/*.json, chunks them using a sliding window
-(400 tokens, 50-token overlap), embeds with sentence-transformers
-all-MiniLM-L6-v2, and upserts into a persistent ChromaDB collection.
+Streams documents from rag/corpus/*.json and *.jsonl, chunks them using a
+sliding window (400 tokens, 50-token overlap; see rag/chunking.py) in a pool
+of worker processes, embeds with sentence-transformers all-MiniLM-L6-v2 in
+batches, and upserts into a persistent ChromaDB collection. Only new or changed chunks are
+embedded (each stores a content hash), and chunks of deleted documents are
+pruned.
 
 Run directly:
-    python -m rag.ingest            # ingest new / changed documents
-    python -m rag.ingest --rebuild  # drop and rebuild the collection from scratch
+    python -m rag.ingest              # ingest new / changed documents
+    python -m rag.ingest --rebuild    # drop and rebuild the collection from scratch
+    python -m rag.ingest --workers 2  # limit chunking processes (default RAG_INGEST_WORKERS)
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import multiprocessing
 import os
 import pathlib
-import sys
-from typing import Optional
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Optional
 
-import chromadb
-import tiktoken
-from sentence_transformers import SentenceTransformer
+from rag.chunking import CHUNK_OVERLAP, CHUNK_SIZE, EMBEDDING_MODEL, _chunk_documents
+
+if TYPE_CHECKING:
+    import chromadb
+    from sentence_transformers import SentenceTransformer
 
 # ── Config ────────────────────────────────────────────────────────────────────
 COLLECTION_NAME = "exercise_guide"
-EMBEDDING_MODEL = "all-MiniLM-L6-v2"
-CHUNK_SIZE      = 400   # tokens
-CHUNK_OVERLAP   = 50    # tokens
 SIMILARITY_METRIC = "cosine"
+EMBED_BATCH_SIZE  = int(os.getenv("RAG_EMBED_BATCH_SIZE", "64"))     # texts per model forward pass
+INGEST_BATCH_SIZE = int(os.getenv("RAG_INGEST_BATCH_SIZE", "512"))   # chunks per encode/upsert call
+_GET_PAGE_SIZE    = 5000   # ids per collection.get() page when reading stored hashes
+INGEST_WORKERS    = int(os.getenv("RAG_INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+DOCS_PER_TASK     = 32     # documents chunked per worker task
+PROGRESS_EVERY    = 1000   # documents between progress lines
+_READ_BLOCK_SIZE  = 64 * 1024   # bytes read at a time from a *.json corpus file
 
 _THIS_DIR   = pathlib.Path(__file__).parent
 CORPUS_DIR  = _THIS_DIR / "corpus"
@@ -35,15 +51,19 @@ CHROMA_PATH = os.getenv(
     "CHROMA_STORE_PATH",
     str(_THIS_DIR / "chroma_store"),
 )
+# Changes whenever the collection's contents do; read by the query-side caches
+CORPUS_VERSION_PATH = pathlib.Path(CHROMA_PATH) / "corpus_version"
 
 # ── Module-level singletons (lazy-initialised) ────────────────────────────────
 _client:     Optional[chromadb.PersistentClient] = None
 _collection  = None
 _embedder:   Optional[SentenceTransformer]       = None
-_tokenizer   = None
 
 
 # ── Singleton accessors ───────────────────────────────────────────────────────
+# chromadb and sentence-transformers (torch) are imported on first use: the
+# spawned chunking workers re-import this module when it is run as
+# `python -m rag.ingest`, and must not load the ML stack just to tokenise.
 
 def get_collection():
     """Return the persistent ChromaDB collection, creating it if needed."""
@@ -51,6 +71,8 @@ def get_collection():
     if _collection is not None:
         return _collection
 
+    import chromadb
+
     _client = chromadb.PersistentClient(path=CHROMA_PATH)
     _collection = _client.get_or_create_collection(
         name=COLLECTION_NAME,
@@ -63,55 +85,163 @@ def get_embedder() -> SentenceTransformer:
     """Return the lazy-loaded sentence-transformers model."""
     global _embedder
     if _embedder is None:
+        from sentence_transformers import SentenceTransformer
+
         _embedder = SentenceTransformer(EMBEDDING_MODEL)
     return _embedder
 
 
-def _get_tokenizer():
-    """Return the lazy-loaded tiktoken encoder."""
-    global _tokenizer
-    if _tokenizer is None:
-        _tokenizer = tiktoken.get_encoding("cl100k_base")
-    return _tokenizer
+# ── Corpus version ────────────────────────────────────────────────────────────
+
+def corpus_version() -> str:
+    """
+    Token identifying the current contents of the collection.
+
+    Stored in a small file next to the Chroma store, so the ingest CLI,
+    add_user_note() and every uvicorn worker agree on it. Caches of
+    retrieval results include it in their keys; "0" before the first write.
+    """
+    try:
+        return CORPUS_VERSION_PATH.read_text(encoding="utf-8").strip() or "0"
+    except OSError:
+        return "0"
+
 
+def bump_corpus_version() -> str:
+    """Record that the collection changed. Call after every write to it."""
+    version = uuid.uuid4().hex
+    CORPUS_VERSION_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CORPUS_VERSION_PATH.with_name(f"{CORPUS_VERSION_PATH.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(version, encoding="utf-8")
+    os.replace(tmp_path, CORPUS_VERSION_PATH)
+    return version
 
-# ── Chunking ──────────────────────────────────────────────────────────────────
 
-def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
+# ── Loading ───────────────────────────────────────────────────────────────────
+
+def _iter_json_array(fh, block_size: int = _READ_BLOCK_SIZE) -> Iterator[dict]:
     """
-    Split text into overlapping token-window chunks.
+    Yield the elements of a top-level JSON array one at a time.
 
-    Returns a list of decoded string chunks. Each chunk is at most
-    chunk_size tokens; consecutive chunks share overlap tokens.
+    The file is read in block_size pieces and each element is decoded as
+    soon as it is complete, so memory holds one element plus one block
+    rather than the whole file. Raises json.JSONDecodeError (a ValueError)
+    on malformed input, after yielding every element before the error.
     """
-    enc    = _get_tokenizer()
-    tokens = enc.encode(text)
+    decoder = json.JSONDecoder()
+    buf     = ""
+    eof     = False
+
+    def fill() -> bool:
+        nonlocal buf, eof
+        if eof:
+            return False
+        block = fh.read(block_size)
+        if not block:
+            eof = True
+            return False
+        buf += block
+        return True
+
+    while not buf.lstrip() and fill():
+        pass
+    buf = buf.lstrip()
+    if not buf.startswith("["):
+        raise json.JSONDecodeError("Expecting a JSON array", buf, 0)
+    buf = buf[1:]
+
+    expect_comma = False
+    while True:
+        buf = buf.lstrip()
+        if not buf:
+            if not fill():
+                raise json.JSONDecodeError("Unterminated array", buf, 0)
+            continue
+        if buf[0] == "]":
+            return
+        if expect_comma:
+            if buf[0] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, 0)
+            buf = buf[1:]
+            expect_comma = False
+            continue
+        try:
+            obj, end = decoder.raw_decode(buf)
+        except json.JSONDecodeError:
+            # Most likely the element continues in the next block
+            if fill():
+                continue
+            raise
+        yield obj
+        buf = buf[end:]
+        expect_comma = True
 
-    if len(tokens) <= chunk_size:
-        return [text]
 
-    chunks: list[str] = []
-    start = 0
-    while start < len(tokens):
-        end = min(start + chunk_size, len(tokens))
-        chunks.append(enc.decode(tokens[start:end]))
-        if end == len(tokens):
-            break
-        start += chunk_size - overlap
+def iter_corpus_file(path: str | pathlib.Path) -> Iterator[dict]:
+    """
+    Stream the documents of one corpus file.
 
-    return chunks
+    *.jsonl files hold one document object per line; *.json files hold a
+    list of documents and are parsed incrementally (see _iter_json_array).
+    """
+    path = pathlib.Path(path)
+    with path.open(encoding="utf-8") as fh:
+        if path.suffix == ".jsonl":
+            for line in fh:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(fh)
 
 
 # ── Ingestion ─────────────────────────────────────────────────────────────────
 
+def _existing_hashes(collection) -> dict[str, str]:
+    """{chunk_id: content_hash} for every curated chunk in the collection.
+
+    User notes are left out so they are never pruned. Chunks ingested before
+    hashes were stored map to "" and are re-embedded once.
+    """
+    hashes: dict[str, str] = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=_GET_PAGE_SIZE, offset=offset)
+        ids  = page["ids"]
+        for chunk_id, meta in zip(ids, page["metadatas"]):
+            meta = meta or {}
+            if meta.get("source") != "UserNote":
+                hashes[chunk_id] = meta.get("content_hash", "")
+        if len(ids) < _GET_PAGE_SIZE:
+            return hashes
+        offset += len(ids)
+
+
+def _upsert_batch(collection, embedder, batch: list[tuple[str, str, dict]]) -> None:
+    """Embed and upsert (chunk_id, chunk, metadata) triples in one call each."""
+    embeddings = embedder.encode(
+        [chunk for _, chunk, _ in batch],
+        batch_size=EMBED_BATCH_SIZE,
+    )
+    collection.upsert(
+        ids        = [chunk_id for chunk_id, _, _ in batch],
+        embeddings = [e.tolist() for e in embeddings],
+        documents  = [chunk for _, chunk, _ in batch],
+        metadatas  = [meta for _, _, meta in batch],
+    )
+
+
 def ingest_corpus(
     corpus_dir: str | pathlib.Path = CORPUS_DIR,
     rebuild: bool = False,
+    workers: int = INGEST_WORKERS,
+    progress_every: int = PROGRESS_EVERY,
 ) -> int:
     """
-    Ingest all *.json files in corpus_dir into the ChromaDB collection.
+    Ingest all *.json and *.jsonl files in corpus_dir into the ChromaDB collection.
 
-    Each JSON file must be a list of document objects matching the schema:
+    A *.json file is a list of document objects; a *.jsonl file has one
+    document object per line. Each document matches the schema:
         {
             "id":       str,          # unique document ID
             "text":     str,          # full text to embed
@@ -124,8 +254,24 @@ def ingest_corpus(
             }
         }
 
+    The corpus is streamed: files are parsed incrementally, documents are
+    chunked and hashed in groups of DOCS_PER_TASK by a pool of `workers`
+    processes (in-process when workers <= 1), and the chunks are embedded
+    and upserted by this process in batches of INGEST_BATCH_SIZE. At most
+    2 × workers groups are in flight, so reading waits for embedding and
+    memory stays bounded however large the corpus is. A progress line is
+    printed every progress_every documents (0 disables it).
+
+    Ingestion is incremental: every chunk is stored with a content_hash in
+    its metadata, and chunks whose hash is unchanged are not re-embedded.
+    Curated chunks that no longer come from any document (deleted
+    documents, documents that now split into fewer chunks) are removed;
+    user notes are kept. Pruning is skipped if a file failed to load, so a
+    bad file cannot wipe its documents from the collection.
+
     If rebuild=True, the collection is deleted and recreated first.
-    Returns the total number of chunks upserted.
+    Every write bumps corpus_version(), which invalidates the query caches.
+    Returns the number of chunks embedded and upserted.
     """
     global _collection
 
@@ -135,59 +281,112 @@ def ingest_corpus(
         _client.delete_collection(COLLECTION_NAME)
         _collection = None
         collection  = get_collection()
+        bump_corpus_version()
         print(f"[ingest] Collection '{COLLECTION_NAME}' rebuilt.")
 
     corpus_dir = pathlib.Path(corpus_dir)
-    json_files = sorted(corpus_dir.glob("*.json"))
+    json_files = sorted([*corpus_dir.glob("*.json"), *corpus_dir.glob("*.jsonl")])
 
     if not json_files:
-        print(f"[ingest] No *.json files found in {corpus_dir}")
+        print(f"[ingest] No *.json / *.jsonl files found in {corpus_dir}")
         return 0
 
+    existing        = _existing_hashes(collection)
+    seen:  set[str] = set()
     embedder        = get_embedder()
-    total_upserted  = 0
-
-    for json_path in json_files:
-        try:
-            docs = json.loads(json_path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError) as exc:
-            print(f"[ingest] Skipping {json_path.name}: {exc}")
-            continue
-
-        for doc in docs:
-            doc_id   = doc.get("id", "")
-            text     = doc.get("text", "")
-            metadata = doc.get("metadata", {})
-
-            if not doc_id or not text:
-                print(f"[ingest] Skipping malformed doc in {json_path.name}")
+    pending: list[tuple[str, str, dict]] = []
+    counts          = {"docs": 0, "upserted": 0, "unchanged": 0}
+    load_failed     = False
+    started         = time.monotonic()
+
+    def flush() -> None:
+        _upsert_batch(collection, embedder, pending)
+        bump_corpus_version()
+        counts["upserted"] += len(pending)
+        pending.clear()
+
+    def consume(chunks: list[tuple[str, str, dict]]) -> None:
+        for chunk_id, chunk, meta in chunks:
+            seen.add(chunk_id)
+            if existing.get(chunk_id) == meta["content_hash"]:
+                counts["unchanged"] += 1
                 continue
-
-            # Sanitise metadata: ChromaDB requires all values to be str/int/float/bool,
-            # and None is not allowed — replace None with empty string.
-            clean_meta: dict = {
-                k: (v if v is not None else "")
-                for k, v in metadata.items()
-            }
-
-            chunks = chunk_text(text)
-
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{doc_id}_c{i}" if len(chunks) > 1 else doc_id
-                embedding = embedder.encode(chunk).tolist()
-
-                collection.upsert(
-                    ids        = [chunk_id],
-                    embeddings = [embedding],
-                    documents  = [chunk],
-                    metadatas  = [clean_meta],
-                )
-                total_upserted += 1
-
-        print(f"[ingest] {json_path.name} — {len(docs)} docs processed.")
-
-    print(f"[ingest] Done. {total_upserted} chunks upserted into '{COLLECTION_NAME}'.")
-    return total_upserted
+            pending.append((chunk_id, chunk, meta))
+            if len(pending) >= INGEST_BATCH_SIZE:
+                flush()
+
+    pool = None
+    if workers > 1:
+        # Spawn, not fork: by now this process holds the embedder's torch/OpenMP
+        # threads and the Chroma client, and may be a running uvicorn worker
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    in_flight: deque[Future] = deque()
+
+    def submit(group: list[dict]) -> None:
+        if pool is None:
+            consume(_chunk_documents(group))
+            return
+        # Back-pressure: wait for the oldest group before queueing another
+        while len(in_flight) >= 2 * workers:
+            consume(in_flight.popleft().result())
+        in_flight.append(pool.submit(_chunk_documents, group))
+
+    try:
+        for json_path in json_files:
+            group: list[dict] = []
+            file_docs = 0
+            try:
+                for doc in iter_corpus_file(json_path):
+                    if not isinstance(doc, dict) or not doc.get("id") or not doc.get("text"):
+                        print(f"[ingest] Skipping malformed doc in {json_path.name}")
+                        continue
+                    group.append(doc)
+                    file_docs += 1
+                    counts["docs"] += 1
+                    if len(group) >= DOCS_PER_TASK:
+                        submit(group)
+                        group = []
+                    if progress_every and counts["docs"] % progress_every == 0:
+                        rate = counts["docs"] / max(time.monotonic() - started, 1e-9)
+                        print(
+                            f"[ingest] {counts['docs']} docs read, {counts['upserted']} chunks "
+                            f"upserted, {counts['unchanged']} unchanged ({rate:.0f} docs/s)"
+                        )
+            except (ValueError, OSError) as exc:
+                print(f"[ingest] Skipping rest of {json_path.name}: {exc}")
+                load_failed = True
+            if group:
+                submit(group)
+            print(f"[ingest] {json_path.name} — {file_docs} docs processed.")
+
+        while in_flight:
+            consume(in_flight.popleft().result())
+        if pending:
+            flush()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    pruned = 0
+    if load_failed:
+        print("[ingest] Some files failed to load; not pruning removed chunks.")
+    else:
+        stale_ids = [chunk_id for chunk_id in existing if chunk_id not in seen]
+        for i in range(0, len(stale_ids), INGEST_BATCH_SIZE):
+            collection.delete(ids=stale_ids[i:i + INGEST_BATCH_SIZE])
+        if stale_ids:
+            bump_corpus_version()
+        pruned = len(stale_ids)
+
+    print(
+        f"[ingest] Done. {counts['docs']} docs, {counts['upserted']} chunks upserted, "
+        f"{counts['unchanged']} unchanged, {pruned} pruned in '{COLLECTION_NAME}' "
+        f"({time.monotonic() - started:.1f}s)."
+    )
+    return counts["upserted"]
 
 
 def add_user_note(user_id: int, note_text: str, exercise_name: str) -> None:
@@ -198,9 +397,6 @@ def add_user_note(user_id: int, note_text: str, exercise_name: str) -> None:
     Notes are stored with source='UserNote' and are retrievable alongside
     curated content.
     """
-    import hashlib
-    import time
-
     note_hash = hashlib.md5(note_text.encode()).hexdigest()[:8]
     note_id   = f"user-{user_id}-{exercise_name.lower().replace(' ', '-')}-{note_hash}"
 
@@ -224,10 +420,25 @@ def add_user_note(user_id: int, note_text: str, exercise_name: str) -> None:
         documents  = [note_text],
         metadatas  = [metadata],
     )
+    bump_corpus_version()
 
 
 # ── CLI entry point ───────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    rebuild = "--rebuild" in sys.argv
-    ingest_corpus(rebuild=rebuild)
+    parser = argparse.ArgumentParser(prog="python -m rag.ingest", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true",
+                        help="drop and rebuild the collection from scratch")
+    parser.add_argument("--corpus-dir", default=str(CORPUS_DIR),
+                        help="directory of *.json / *.jsonl corpus files")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS,
+                        help="chunking processes (1 = chunk in this process)")
+    parser.add_argument("--progress-every", type=int, default=PROGRESS_EVERY,
+                        help="documents between progress lines (0 = off)")
+    args = parser.parse_args()
+    ingest_corpus(
+        corpus_dir=args.corpus_dir,
+        rebuild=args.rebuild,
+        workers=args.workers,
+        progress_every=args.progress_every,
+    )
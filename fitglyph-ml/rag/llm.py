@@ -0,0 +1,108 @@
+"""
+Chat model used by the RAG engine.
+
+One client is built per process on first use and reused for every request
+(constructing ChatGroq per call re-created its HTTP client and connection
+pool each time).
+
+Provider selection (RAG_LLM_PROVIDER):
+  groq  (default)  ChatGroq llama-3.3-70b-versatile; needs GROQ_API_KEY
+  fake             FakeChatModel — deterministic, offline, no API key.
+                   For tests and local development; RAG_FAKE_LLM_DELAY adds
+                   a per-call latency in seconds to mimic a real model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+LLM_PROVIDER   = os.getenv("RAG_LLM_PROVIDER", "groq").lower()
+LLM_MODEL      = "llama-3.3-70b-versatile"
+GROQ_API_KEY   = os.getenv("GROQ_API_KEY", "")
+FAKE_LLM_DELAY = float(os.getenv("RAG_FAKE_LLM_DELAY", "0"))
+
+_llm      = None
+_llm_lock = threading.Lock()
+
+
+class FakeChatModel:
+    """
+    Offline stand-in for a LangChain chat model.
+
+    invoke() / ainvoke() / astream() accept the same role/content message dicts as
+    _call_llm and answer with a fixed template naming the question, so
+    tests can assert on the output. `calls` counts invocations.
+    """
+
+    model_name = "fake"
+
+    def __init__(self, delay: float = FAKE_LLM_DELAY):
+        self.delay = delay
+        self.calls = 0
+
+    def _answer(self, messages: list[dict]) -> str:
+        self.calls += 1
+        user_content = messages[-1]["content"]
+        question     = user_content.split("\n", 1)[0].removeprefix("Question: ")
+        n_sources    = user_content.count("[Source ")
+        return f"[fake answer] {question} ({n_sources} sources)"
+
+    def invoke(self, messages: list[dict]):
+        if self.delay:
+            time.sleep(self.delay)
+        return SimpleNamespace(content=self._answer(messages))
+
+    async def ainvoke(self, messages: list[dict]):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return SimpleNamespace(content=self._answer(messages))
+
+    async def astream(self, messages: list[dict]):
+        """Yield the answer word by word, spreading `delay` across the words."""
+        words = self._answer(messages).split(" ")
+        for i, word in enumerate(words):
+            if self.delay:
+                await asyncio.sleep(self.delay / len(words))
+            yield SimpleNamespace(content=word if i == 0 else " " + word)
+
+
+def llm_configured() -> bool:
+    """True if get_llm() can build a client (otherwise callers fall back to excerpts)."""
+    return LLM_PROVIDER == "fake" or bool(GROQ_API_KEY)
+
+
+def llm_name() -> str:
+    """Identifies the model in cache keys, so switching models never serves stale answers."""
+    return "fake" if LLM_PROVIDER == "fake" else f"groq:{LLM_MODEL}"
+
+
+def get_llm():
+    """Return the process-wide chat model, creating it on first use."""
+    global _llm
+    if _llm is not None:
+        return _llm
+    with _llm_lock:
+        if _llm is None:
+            if LLM_PROVIDER == "fake":
+                _llm = FakeChatModel()
+            else:
+                from langchain_groq import ChatGroq
+                _llm = ChatGroq(model=LLM_MODEL, temperature=0, api_key=GROQ_API_KEY)
+    return _llm
+
+
+def to_provider_messages(messages: list[dict]) -> list:
+    """Role/content dicts → the message objects the configured provider expects."""
+    if LLM_PROVIDER == "fake":
+        return messages
+
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    return [
+        SystemMessage(content=m["content"]) if m["role"] == "system" else HumanMessage(content=m["content"])
+        for m in messages
+    ]
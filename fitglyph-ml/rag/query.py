@@ -6,6 +6,10 @@ optionally injects workout log context when the queried exercise exists
 in the user's history, then calls the LLM (Groq llama-3.3-70b-versatile)
 with a structured technique-focused prompt.
 
+Answers are cached by the retrieved chunks and workout context; a question
+close enough to a cached one (embedding similarity >= 0.95) reuses its
+answer without an LLM call.
+
 Retrieval config (from ML_FEATURES.md):
   - Embedding model : all-MiniLM-L6-v2
   - Chunk size      : 400 tokens, 50-token overlap  (set at ingest time)
@@ -16,14 +20,22 @@ Retrieval config (from ML_FEATURES.md):
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional
 
+import numpy as np
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from rag.ingest import get_collection, get_embedder
+from caching.backends import get_cache
+from rag.ingest import EMBEDDING_MODEL, corpus_version, get_collection, get_embedder
+from rag.llm import get_llm, llm_configured, llm_name, to_provider_messages
 
 router = APIRouter()
 
@@ -32,9 +44,29 @@ TOP_K               = 5
 SIMILARITY_THRESHOLD = 0.72
 DISTANCE_THRESHOLD   = 1.0 - SIMILARITY_THRESHOLD   # 0.28 for cosine distance
 
-GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 
+# Threads for embedding and Chroma queries, which block and are CPU-bound;
+# kept small so concurrent questions do not oversubscribe the CPU
+RAG_EXECUTOR_WORKERS = int(os.getenv("RAG_EXECUTOR_WORKERS", "2"))
+_executor = ThreadPoolExecutor(max_workers=RAG_EXECUTOR_WORKERS, thread_name_prefix="rag")
+
+_engine      = None
+_engine_lock = threading.Lock()
+
+# Answer cache: a question whose embedding is at least this similar to a
+# cached question with the same chunks and workout context reuses its answer
+ANSWER_SIMILARITY_THRESHOLD = float(os.getenv("RAG_ANSWER_SIMILARITY", "0.95"))
+ANSWER_CACHE_TTL            = float(os.getenv("RAG_ANSWER_CACHE_TTL", str(24 * 3600)))
+_ANSWERS_PER_KEY            = 8   # distinct phrasings kept per answer-cache key
+
+# Normalised question → embedding (list[float]). Independent of the corpus.
+_embedding_cache = get_cache("rag_embedding")
+# (embedding digest, n_results, corpus_version) → retrieved chunks
+_retrieval_cache = get_cache("rag_retrieval")
+# (model, corpus_version, chunk ids, workout context hash) → [(embedding, answer)]
+_answer_cache = get_cache("rag_answer", default_ttl=ANSWER_CACHE_TTL)
+
 
 # ── Request / Response models ─────────────────────────────────────────────────
 
@@ -42,10 +74,22 @@ class RAGQuery(BaseModel):
     question:      str
     exercise_hint: Optional[str] = None
     user_id:       Optional[int] = None
+    stream:        bool          = False
 
 
 # ── Workout context ───────────────────────────────────────────────────────────
 
+def _get_engine():
+    """Return the workout DB engine, created once per process."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from sqlalchemy import create_engine
+                _engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    return _engine
+
+
 def _get_workout_context(user_id: int, exercise_hint: str) -> Optional[str]:
     """
     Query the SQLite workout DB for recent history of exercise_hint for this user.
@@ -57,9 +101,9 @@ def _get_workout_context(user_id: int, exercise_hint: str) -> Optional[str]:
         return None
 
     try:
-        from sqlalchemy import create_engine, text
+        from sqlalchemy import text
 
-        engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+        engine = _get_engine()
 
         # Build a LIKE pattern to match exercise name variants (case-insensitive)
         pattern = f"%{exercise_hint.strip()}%"
@@ -99,36 +143,75 @@ def _get_workout_context(user_id: int, exercise_hint: str) -> Optional[str]:
 
 # ── Retrieval ─────────────────────────────────────────────────────────────────
 
-def _retrieve(question: str, n_results: int = TOP_K) -> list[dict]:
+def _normalize_question(question: str) -> str:
+    """
+    Case- and whitespace-folded question used as the embedding cache key.
+
+    all-MiniLM-L6-v2 uses an uncased tokenizer that also ignores runs of
+    whitespace, so every question with the same normal form has the same
+    embedding.
+    """
+    return " ".join(question.lower().split())
+
+
+def _embed_question(question: str) -> list[float]:
+    """Embedding of the question, from the cache when it has been asked before."""
+    key = (EMBEDDING_MODEL, _normalize_question(question))
+    query_vec = _embedding_cache.get(key)
+    if query_vec is None:
+        query_vec = get_embedder().encode(key[1]).tolist()
+        _embedding_cache.set(key, query_vec)
+    return query_vec
+
+
+def _embedding_digest(query_vec: list[float]) -> str:
+    return hashlib.sha1(np.asarray(query_vec, dtype=np.float32).tobytes()).hexdigest()
+
+
+def _retrieve(question: str, n_results: int = TOP_K) -> tuple[Optional[list[float]], list[dict]]:
     """
     Embed the question and query ChromaDB for the top-n most similar chunks.
 
-    Returns only chunks whose cosine distance is <= DISTANCE_THRESHOLD
-    (i.e., cosine similarity >= SIMILARITY_THRESHOLD).
-    Returns an empty list if the collection is empty or unavailable.
+    Returns (question embedding, chunks). Only chunks whose cosine distance
+    is <= DISTANCE_THRESHOLD (i.e., cosine similarity >= SIMILARITY_THRESHOLD)
+    are kept. Returns (None, []) if the collection is unavailable, and an
+    empty chunk list if it is empty.
+
+    Embeddings and results are cached; results are keyed by corpus_version()
+    so any ingest or new user note invalidates them. Blocking — the route
+    runs it on _executor.
     """
+    query_vec = None
     try:
-        collection = get_collection()
-        if collection.count() == 0:
-            return []
+        query_vec = _embed_question(question)
+        key       = (_embedding_digest(query_vec), n_results, corpus_version())
+
+        chunks = _retrieval_cache.get(key)
+        if chunks is not None:
+            return query_vec, chunks
 
-        embedder  = get_embedder()
-        query_vec = embedder.encode(question).tolist()
+        collection = get_collection()
+        count      = collection.count()
+        if count == 0:
+            _retrieval_cache.set(key, [])
+            return query_vec, []
 
         results = collection.query(
             query_embeddings=[query_vec],
-            n_results=min(n_results, collection.count()),
+            n_results=min(n_results, count),
             include=["documents", "metadatas", "distances"],
         )
 
-        chunks: list[dict] = []
+        chunks = []
+        ids       = results.get("ids",       [[]])[0]
         documents = results.get("documents", [[]])[0]
         metadatas = results.get("metadatas", [[]])[0]
         distances = results.get("distances",  [[]])[0]
 
-        for doc, meta, dist in zip(documents, metadatas, distances):
+        for chunk_id, doc, meta, dist in zip(ids, documents, metadatas, distances):
             if dist <= DISTANCE_THRESHOLD:
                 chunks.append({
+                    "id":            chunk_id,
                     "text":          doc,
                     "source":        meta.get("source", "Unknown"),
                     "exercise_name": meta.get("exercise_name", ""),
@@ -136,10 +219,11 @@ def _retrieve(question: str, n_results: int = TOP_K) -> list[dict]:
                     "distance":      dist,
                 })
 
-        return chunks
+        _retrieval_cache.set(key, chunks)
+        return query_vec, chunks
 
     except Exception:
-        return []
+        return query_vec, []
 
 
 # ── Prompt building ───────────────────────────────────────────────────────────
@@ -184,24 +268,185 @@ def _build_messages(
 
 # ── LLM call ─────────────────────────────────────────────────────────────────
 
-def _call_llm(messages: list[dict]) -> str:
+async def _call_llm(messages: list[dict]) -> str:
     """
-    Call Groq via langchain_groq. Returns the answer string.
+    Call the configured chat model (see rag/llm.py) without blocking the
+    event loop. Returns the answer string.
     Raises on error — caller handles graceful degradation.
     """
-    from langchain_groq import ChatGroq
-    from langchain_core.messages import SystemMessage, HumanMessage
+    response = await get_llm().ainvoke(to_provider_messages(messages))
+    return response.content
+
+
+# ── Answer cache ──────────────────────────────────────────────────────────────
+
+def _answer_key(chunks: list[dict], workout_context: Optional[str]) -> tuple:
+    """
+    Everything besides the question that determines the LLM's answer.
+
+    The retrieved chunk ids and corpus version pin the source text; the
+    workout context is hashed so user history is not kept in the key.
+    """
+    context_hash = hashlib.sha1((workout_context or "").encode("utf-8")).hexdigest()
+    return (
+        llm_name(),
+        corpus_version(),
+        tuple(c["id"] for c in chunks),
+        context_hash,
+    )
+
+
+def _cached_answer(key: tuple, query_vec: list[float]) -> Optional[str]:
+    """
+    A cached answer for a near-duplicate question under the same key, or None.
+
+    Questions match when the cosine similarity of their embeddings is at
+    least ANSWER_SIMILARITY_THRESHOLD; the closest match wins.
+    """
+    entries = _answer_cache.get(key)
+    if not entries:
+        return None
+
+    q       = np.asarray(query_vec, dtype=np.float32)
+    stored  = np.asarray([vec for vec, _ in entries], dtype=np.float32)
+    norms   = np.linalg.norm(stored, axis=1) * np.linalg.norm(q)
+    sims    = stored @ q / np.where(norms == 0, 1.0, norms)
+    best    = int(np.argmax(sims))
+    if sims[best] >= ANSWER_SIMILARITY_THRESHOLD:
+        return entries[best][1]
+    return None
+
+
+def _store_answer(key: tuple, query_vec: list[float], answer: str) -> None:
+    """Add a phrasing's answer under key, keeping the newest _ANSWERS_PER_KEY."""
+    entries = list(_answer_cache.get(key) or [])
+    entries.append((query_vec, answer))
+    _answer_cache.set(key, entries[-_ANSWERS_PER_KEY:])
+
+
+# ── Answer assembly ───────────────────────────────────────────────────────────
+
+NO_CONTEXT_ANSWER = (
+    "The exercise library doesn't have enough context to answer this "
+    "question. Try asking about a specific lift technique, common errors, "
+    "or muscle activation cues for the main barbell movements."
+)
+
+
+async def _retrieve_with_context(
+    question:      str,
+    exercise_hint: Optional[str],
+    user_id:       Optional[int],
+) -> tuple[Optional[list[float]], list[dict], Optional[str]]:
+    """
+    Retrieval and the workout-context lookup, concurrently and off the event loop.
+
+    Returns (question embedding, chunks, workout context).
+    """
+    loop = asyncio.get_running_loop()
+
+    async def workout_context_lookup() -> Optional[str]:
+        if not (exercise_hint and user_id):
+            return None
+        return await asyncio.to_thread(_get_workout_context, user_id, exercise_hint)
+
+    (query_vec, chunks), workout_context = await asyncio.gather(
+        loop.run_in_executor(_executor, _retrieve, question),
+        workout_context_lookup(),
+    )
+    return query_vec, chunks, workout_context
+
+
+def _build_citations(chunks: list[dict]) -> list[dict]:
+    """One citation per source — the first (closest) excerpt of each."""
+    citations = []
+    seen_sources: set[str] = set()
+    for chunk in chunks:
+        source = chunk["source"]
+        if source not in seen_sources:
+            seen_sources.add(source)
+            citations.append({
+                "source":  source,
+                "excerpt": chunk["text"][:200].replace("\n", " "),
+                "url":     chunk["url"],
+            })
+    return citations
+
+
+def _excerpt_answer(chunks: list[dict]) -> str:
+    """Stitched excerpts, used when the LLM is unavailable or fails."""
+    return "\n\n".join(
+        f"[{c['source']}] {c['text'][:400]}" for c in chunks[:3]
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    """One server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_answer(
+    question:      str,
+    exercise_hint: Optional[str],
+    user_id:       Optional[int],
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for one question:
+
+        event: citations  {"citations": [...], "workout_context_used": bool}
+        event: token      {"text": str}           (one or more)
+        event: error      {"error": "llm_failed"} (only if the LLM fails mid-answer)
+        event: done       {}
 
-    lc_messages = []
-    for m in messages:
-        if m["role"] == "system":
-            lc_messages.append(SystemMessage(content=m["content"]))
+    Citations are sent as soon as retrieval finishes, then answer tokens as
+    the LLM produces them. Cached and fallback answers arrive as a single
+    token event.
+    """
+    query_vec, chunks, workout_context = await _retrieve_with_context(
+        question, exercise_hint, user_id
+    )
+
+    yield _sse("citations", {
+        "citations":            _build_citations(chunks),
+        "workout_context_used": bool(chunks) and workout_context is not None,
+    })
+
+    if not chunks:
+        yield _sse("token", {"text": NO_CONTEXT_ANSWER})
+        yield _sse("done", {})
+        return
+
+    if not llm_configured():
+        yield _sse("token", {"text": _excerpt_answer(chunks)})
+        yield _sse("done", {})
+        return
+
+    answer_key = _answer_key(chunks, workout_context)
+    answer     = _cached_answer(answer_key, query_vec)
+    if answer is not None:
+        yield _sse("token", {"text": answer})
+        yield _sse("done", {})
+        return
+
+    parts: list[str] = []
+    try:
+        messages = _build_messages(question, chunks, workout_context)
+        async for piece in get_llm().astream(to_provider_messages(messages)):
+            text = piece.content
+            if text:
+                parts.append(text)
+                yield _sse("token", {"text": text})
+    except Exception:
+        if parts:
+            yield _sse("error", {"error": "llm_failed"})
         else:
-            lc_messages.append(HumanMessage(content=m["content"]))
+            # Nothing streamed yet — fall back to raw excerpts, as the JSON path does
+            yield _sse("token", {"text": _excerpt_answer(chunks)})
+        yield _sse("done", {})
+        return
 
-    llm      = ChatGroq(model="llama-3.3-70b-versatile", temperature=0, api_key=GROQ_API_KEY)
-    response = llm.invoke(lc_messages)
-    return response.content
+    _store_answer(answer_key, query_vec, "".join(parts))
+    yield _sse("done", {})
 
 
 # ── FastAPI route ─────────────────────────────────────────────────────────────
@@ -215,11 +460,15 @@ async def rag_query(body: RAGQuery):
         question      : str           — the user's technique / exercise question
         exercise_hint : str | null    — exercise name for workout context lookup
         user_id       : int | null    — injected by Flask proxy from session
+        stream        : bool          — stream the answer as server-sent events
 
     Response:
         answer              : str
         citations           : [{ source, excerpt, url }]
         workout_context_used: bool
+
+    With stream=true the response is text/event-stream instead; see
+    _stream_answer for the events.
     """
     question      = body.question.strip()
     exercise_hint = (body.exercise_hint or "").strip() or None
@@ -231,54 +480,48 @@ async def rag_query(body: RAGQuery):
             content={"error": "empty_question", "message": "Question must not be empty."},
         )
 
-    # ── Retrieve ──────────────────────────────────────────────────────────────
-    chunks = _retrieve(question)
+    if body.stream:
+        return StreamingResponse(
+            _stream_answer(question, exercise_hint, user_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # ── Retrieve + workout context, concurrently and off the event loop ──────
+    query_vec, chunks, workout_context = await _retrieve_with_context(
+        question, exercise_hint, user_id
+    )
 
     if not chunks:
         return JSONResponse(
             content={
-                "answer": (
-                    "The exercise library doesn't have enough context to answer this "
-                    "question. Try asking about a specific lift technique, common errors, "
-                    "or muscle activation cues for the main barbell movements."
-                ),
+                "answer":               NO_CONTEXT_ANSWER,
                 "citations":            [],
                 "workout_context_used": False,
             }
         )
 
-    # ── Workout context ───────────────────────────────────────────────────────
-    workout_context     = None
-    workout_context_used = False
-
-    if exercise_hint and user_id:
-        workout_context = _get_workout_context(user_id, exercise_hint)
-        if workout_context:
-            workout_context_used = True
+    workout_context_used = workout_context is not None
 
-    # ── Build citations ───────────────────────────────────────────────────────
-    citations = []
-    seen_sources: set[str] = set()
-    for chunk in chunks:
-        source = chunk["source"]
-        # Deduplicate by source name — keep the first (closest) excerpt per source
-        if source not in seen_sources:
-            seen_sources.add(source)
-            citations.append({
-                "source":  source,
-                "excerpt": chunk["text"][:200].replace("\n", " "),
-                "url":     chunk["url"],
-            })
+    citations = _build_citations(chunks)
 
     # ── LLM synthesis ─────────────────────────────────────────────────────────
-    if not GROQ_API_KEY:
+    if not llm_configured():
         # Degrade gracefully: return stitched excerpts without LLM synthesis
-        raw_answer = "\n\n".join(
-            f"[{c['source']}] {c['text'][:400]}" for c in chunks[:3]
+        return JSONResponse(
+            content={
+                "answer":               _excerpt_answer(chunks),
+                "citations":            citations,
+                "workout_context_used": workout_context_used,
+            }
         )
+
+    answer_key = _answer_key(chunks, workout_context)
+    answer     = _cached_answer(answer_key, query_vec)
+    if answer is not None:
         return JSONResponse(
             content={
-                "answer":               raw_answer,
+                "answer":               answer,
                 "citations":            citations,
                 "workout_context_used": workout_context_used,
             }
@@ -286,20 +529,18 @@ async def rag_query(body: RAGQuery):
 
     try:
         messages = _build_messages(question, chunks, workout_context)
-        answer   = _call_llm(messages)
-    except Exception as exc:
+        answer   = await _call_llm(messages)
+    except Exception:
         # LLM failure — fall back to raw excerpts, never 500
-        raw_answer = "\n\n".join(
-            f"[{c['source']}] {c['text'][:400]}" for c in chunks[:3]
-        )
         return JSONResponse(
             content={
-                "answer":               raw_answer,
+                "answer":               _excerpt_answer(chunks),
                 "citations":            citations,
                 "workout_context_used": workout_context_used,
             }
         )
 
+    _store_answer(answer_key, query_vec, answer)
     return JSONResponse(
         content={
             "answer":               answer,
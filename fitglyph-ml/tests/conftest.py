@@ -0,0 +1,16 @@
+"""
+Test setup for the ML service.
+
+Run from fitglyph-ml/:  python -m pytest tests
+"""
+
+import os
+import pathlib
+import sys
+import tempfile
+
+# Engines are imported as top-level packages (fatigue, bayesian, ...), as main.py does
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+# Importing an engine opens its result store; keep it out of the working tree
+os.environ.setdefault("ML_STORE_PATH", os.path.join(tempfile.mkdtemp(), "ml_store.sqlite3"))
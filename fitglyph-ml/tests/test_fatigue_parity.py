@@ -0,0 +1,141 @@
+"""
+Parity of the NumPy fatigue kernels with the pandas implementation they replaced.
+
+The reference for each kernel is the pandas code it replaced: a daily
+reindex with fill_value=0, Series.ewm(span, adjust=False).mean(), and
+Series.mean() / std(ddof=1) / sum() for monotony and strain. pandas is only
+needed to run these tests.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from fatigue.compute import (  # noqa: E402
+    _ACUTE_SPAN,
+    _CHRONIC_SPAN,
+    _build_daily_vl,
+    _compute_metrics,
+    _compute_metrics_batch,
+    _ewma,
+)
+
+SPANS = (_ACUTE_SPAN, _CHRONIC_SPAN)
+
+
+# ── pandas references ─────────────────────────────────────────────────────────
+
+def _pd_daily_vl(daily_vl: dict) -> pd.Series:
+    if not daily_vl:
+        return pd.Series(dtype=float)
+    all_dates = sorted(daily_vl)
+    idx = pd.date_range(start=all_dates[0], end=all_dates[-1], freq="D")
+    return pd.Series({pd.Timestamp(d): v for d, v in daily_vl.items()}).reindex(idx, fill_value=0.0)
+
+
+def _pd_metrics(acute_load: float, chronic_load: float, last_7: pd.Series) -> dict:
+    acwr = acute_load / chronic_load if chronic_load > 0 else 0.0
+    mean_7 = float(last_7.mean())
+    std_7 = float(last_7.std(ddof=1)) if len(last_7) > 1 else 0.0
+    monotony = mean_7 / std_7 if std_7 > 0 else 0.0
+    strain = float(last_7.sum()) * monotony
+    return {
+        "acwr": round(acwr, 4),
+        "acute_load": round(acute_load, 2),
+        "chronic_load": round(chronic_load, 2),
+        "monotony": round(monotony, 4),
+        "strain": round(strain, 2),
+    }
+
+
+# ── Inputs ────────────────────────────────────────────────────────────────────
+
+def _random_logs(rng: np.random.Generator, n_days: int, p_logged: float) -> dict:
+    """{date: VL} over n_days with gaps, rest days (0 VL) and repeated values."""
+    start = date(2025, 1, 1) + timedelta(days=int(rng.integers(0, 365)))
+    logs = {}
+    for offset in range(n_days):
+        if offset in (0, n_days - 1) or rng.random() < p_logged:
+            vl = float(rng.choice([0.0, 2500.0, rng.uniform(0, 20000)]))
+            logs[start + timedelta(days=offset)] = vl
+    return logs
+
+
+def _random_cases():
+    rng = np.random.default_rng(20260101)
+    for _ in range(200):
+        yield _random_logs(rng, int(rng.integers(1, 400)), float(rng.uniform(0.1, 1.0)))
+
+
+EDGE_CASES = {
+    "empty": {},
+    "single_day": {date(2025, 3, 14): 5400.0},
+    "single_rest_day": {date(2025, 3, 14): 0.0},
+    "two_days_long_gap": {date(2025, 1, 1): 3000.0, date(2025, 6, 1): 4500.0},
+    "constant": {date(2025, 1, 1) + timedelta(days=i): 1000.0 for i in range(40)},
+    "all_zero": {date(2025, 1, 1) + timedelta(days=i): 0.0 for i in range(10)},
+    "unsorted_keys": {date(2025, 1, 9): 1.0, date(2025, 1, 1): 2.0, date(2025, 1, 5): 3.0},
+}
+
+
+def _all_cases():
+    yield from EDGE_CASES.values()
+    yield from _random_cases()
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("name", EDGE_CASES)
+def test_daily_vl_edge_cases(name):
+    _check_daily_vl(EDGE_CASES[name])
+
+
+def test_daily_vl_random():
+    for logs in _random_cases():
+        _check_daily_vl(logs)
+
+
+def _check_daily_vl(logs):
+    start, values = _build_daily_vl(logs)
+    expected = _pd_daily_vl(logs)
+    if expected.empty:
+        assert start is None and len(values) == 0
+        return
+    assert start == expected.index[0].date()
+    np.testing.assert_array_equal(values, expected.to_numpy())
+
+
+@pytest.mark.parametrize("span", SPANS)
+def test_ewma_matches_pandas_bit_for_bit(span):
+    for logs in _all_cases():
+        _, values = _build_daily_vl(logs)
+        expected = pd.Series(values, dtype=float).ewm(span=span, adjust=False).mean().to_numpy()
+        np.testing.assert_array_equal(_ewma(values, span), expected)
+
+
+def test_metrics_match_pandas():
+    for logs in _all_cases():
+        series = _pd_daily_vl(logs)
+        if series.empty:
+            continue
+        values = series.to_numpy()
+        acute = float(_ewma(values, _ACUTE_SPAN)[-1])
+        chronic = float(_ewma(values, _CHRONIC_SPAN)[-1])
+        metrics = _compute_metrics(acute, chronic, values[-_ACUTE_SPAN:])
+        expected = _pd_metrics(acute, chronic, series.iloc[-_ACUTE_SPAN:])
+        for key, value in expected.items():
+            assert metrics[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+
+
+def test_batch_metrics_match_single():
+    rng = np.random.default_rng(7)
+    for width in range(1, _ACUTE_SPAN + 1):
+        last_7 = rng.choice([0.0, 1000.0, 5000.0], size=(25, width))
+        acute = rng.uniform(0, 6000, size=25)
+        chronic = np.where(rng.random(25) < 0.2, 0.0, rng.uniform(0, 6000, size=25))
+        batch = _compute_metrics_batch(acute, chronic, last_7)
+        for i in range(25):
+            assert batch[i] == _compute_metrics(float(acute[i]), float(chronic[i]), last_7[i])
@@ -0,0 +1,37 @@
+"""Add composite index for per-user workout listings
+
+Revision ID: 012_add_workout_listing_index
+Revises: 011_normalize_exercise_names
+Create Date: 2026-10-16
+
+Adds ix_workout_user_draft_date on workout(user_id, is_draft, date).
+/api/workouts and /history page through a user's completed workouts with
+keyset cursors on (date, id); this index turns each page into a range scan
+instead of a sort over the user's whole history.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '012_add_workout_listing_index'
+down_revision = '011_normalize_exercise_names'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_workout_user_draft_date'
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing = [ix['name'] for ix in inspector.get_indexes('workout')]
+    if INDEX_NAME not in existing:
+        op.create_index(INDEX_NAME, 'workout', ['user_id', 'is_draft', 'date'])
+        print(f"[MIGRATION] Created index {INDEX_NAME}")
+    else:
+        print(f"[MIGRATION] Index {INDEX_NAME} already exists, skipping")
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name='workout')
+    print(f"[MIGRATION] Dropped index {INDEX_NAME}")
@@ -0,0 +1,123 @@
+"""Add exercise_set table and backfill it from exercise.set_data
+
+Revision ID: 013_add_exercise_set
+Revises: 012_add_workout_listing_index
+Create Date: 2026-10-16
+
+Creates exercise_set (one row per logged set) so volume-load and 1RM
+queries can aggregate sets in SQL instead of re-parsing the set_data JSON
+text on every request. exercise.set_data is kept: it still carries the
+drop-set stages and superset A/B values the UI renders, and the app writes
+both from now on.
+
+Backfill reads set_data in batches; rows whose JSON cannot be parsed are
+left without set rows (readers fall back to the top-level sets/reps/weight
+columns exactly as they did before).
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '013_add_exercise_set'
+down_revision = '012_add_workout_listing_index'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _to_number(value, cast):
+    if value is None or value == '':
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _set_rows(exercise_id, set_data_raw):
+    """Parse one set_data value into exercise_set dicts (same rules as the app)."""
+    try:
+        sets = json.loads(set_data_raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(sets, list):
+        return []
+
+    rows = []
+    for idx, s in enumerate(sets):
+        if not isinstance(s, dict):
+            continue
+        rows.append({
+            'exercise_id': exercise_id,
+            'set_number': _to_number(s.get('set_number'), int) or idx + 1,
+            'reps': _to_number(s.get('reps'), int),
+            'weight': _to_number(s.get('weight'), float),
+            'completed': bool(s.get('completed', True)),
+        })
+    return rows
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'exercise_set' in inspector.get_table_names():
+        print("[MIGRATION] exercise_set table already exists, skipping")
+        return
+
+    op.create_table(
+        'exercise_set',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('set_number', sa.Integer(), nullable=False),
+        sa.Column('reps', sa.Integer(), nullable=True),
+        sa.Column('weight', sa.Float(), nullable=True),
+        sa.Column('completed', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercise.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_exercise_set_exercise_id', 'exercise_set', ['exercise_id'])
+    print("[MIGRATION] Created exercise_set table")
+
+    exercise_table = sa.table(
+        'exercise',
+        sa.column('id', sa.Integer),
+        sa.column('set_data', sa.Text),
+    )
+    exercise_set_table = sa.table(
+        'exercise_set',
+        sa.column('exercise_id', sa.Integer),
+        sa.column('set_number', sa.Integer),
+        sa.column('reps', sa.Integer),
+        sa.column('weight', sa.Float),
+        sa.column('completed', sa.Boolean),
+    )
+
+    # Keyset over exercise.id so memory stays flat on large tables
+    last_id = 0
+    backfilled = 0
+    while True:
+        batch = conn.execute(
+            sa.select(exercise_table.c.id, exercise_table.c.set_data)
+            .where(exercise_table.c.id > last_id, exercise_table.c.set_data.isnot(None))
+            .order_by(exercise_table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not batch:
+            break
+        rows = [r for exercise_id, raw in batch for r in _set_rows(exercise_id, raw)]
+        if rows:
+            op.bulk_insert(exercise_set_table, rows)
+            backfilled += len(rows)
+        last_id = batch[-1][0]
+
+    print(f"[MIGRATION] Backfilled {backfilled} exercise_set rows from set_data")
+
+
+def downgrade():
+    op.drop_index('ix_exercise_set_exercise_id', table_name='exercise_set')
+    op.drop_table('exercise_set')
+    print("[MIGRATION] Dropped exercise_set table")
@@ -0,0 +1,50 @@
+"""Add daily_training_load rollup table
+
+Revision ID: 014_add_daily_training_load
+Revises: 013_add_exercise_set
+Create Date: 2026-10-16
+
+Creates daily_training_load: one row per user per local day holding that
+day's total volume load and completed-workout count. The app keeps it up to
+date on every workout write; the ML fatigue engine reads it instead of
+scanning the user's full exercise history.
+
+Existing history is not backfilled here because bucketing into local days
+depends on each user's timezone offset. After upgrading run:
+
+    python backfill_training_load.py
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '014_add_daily_training_load'
+down_revision = '013_add_exercise_set'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'daily_training_load' in inspector.get_table_names():
+        print("[MIGRATION] daily_training_load table already exists, skipping")
+        return
+
+    op.create_table(
+        'daily_training_load',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('local_date', sa.Date(), nullable=False),
+        sa.Column('volume_load', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('workout_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'local_date'),
+    )
+    print("[MIGRATION] Created daily_training_load table "
+          "(run backfill_training_load.py to populate existing history)")
+
+
+def downgrade():
+    op.drop_table('daily_training_load')
+    print("[MIGRATION] Dropped daily_training_load table")
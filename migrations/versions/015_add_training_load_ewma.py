@@ -0,0 +1,38 @@
+"""Add EWMA state columns to daily_training_load
+
+Revision ID: 015_add_training_load_ewma
+Revises: 014_add_daily_training_load
+Create Date: 2026-10-16
+
+Adds acute_load / chronic_load: the span-7 and span-28 EWMA of the daily
+volume-load series as of each row's day. The fatigue engine reads the
+latest row's state instead of re-running the EWMA over the full history.
+
+Existing rows are left NULL; re-run `python backfill_training_load.py` to
+fill them. Until then the app re-walks a user's whole history on their
+next workout write and the fatigue engine computes from the daily totals.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = '015_add_training_load_ewma'
+down_revision = '014_add_daily_training_load'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [c['name'] for c in inspector.get_columns('daily_training_load')]
+    if 'acute_load' not in columns:
+        op.add_column('daily_training_load', sa.Column('acute_load', sa.Float(), nullable=True))
+    if 'chronic_load' not in columns:
+        op.add_column('daily_training_load', sa.Column('chronic_load', sa.Float(), nullable=True))
+    print("[MIGRATION] Added EWMA state columns to daily_training_load")
+
+
+def downgrade():
+    op.drop_column('daily_training_load', 'chronic_load')
+    op.drop_column('daily_training_load', 'acute_load')
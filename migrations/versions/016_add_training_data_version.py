@@ -0,0 +1,38 @@
+"""Add training_data_version to users
+
+Revision ID: 016_add_training_data_version
+Revises: 015_add_training_load_ewma
+Create Date: 2026-10-16
+
+Adds users.training_data_version: a per-user counter incremented by every
+workout write (see training_load.py). The ML service stamps each cached
+result with the version it was computed from and treats a mismatch as a
+cache miss, so no invalidation call is needed on the save path.
+
+Existing users start at 0; results cached before this migration carry no
+stamp and are recomputed on first read.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = '016_add_training_data_version'
+down_revision = '015_add_training_load_ewma'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [c['name'] for c in inspector.get_columns('users')]
+    if 'training_data_version' not in columns:
+        op.add_column(
+            'users',
+            sa.Column('training_data_version', sa.Integer(), nullable=False, server_default='0'),
+        )
+    print("[MIGRATION] Added training_data_version to users")
+
+
+def downgrade():
+    op.drop_column('users', 'training_data_version')
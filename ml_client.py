@@ -0,0 +1,213 @@
+"""
+Shared HTTP client for calls from the Flask app to the ML service.
+
+Every proxy route and the background event dispatcher go through one
+MLClient per process:
+
+  pooling     one requests.Session with a keep-alive connection pool of
+              ML_POOL_SIZE connections (default 10). Size it to gunicorn's
+              --threads plus the fan-out of the dashboard route; a sync
+              worker needs only a few.
+  timeouts    a short connect timeout (ML_CONNECT_TIMEOUT, default 0.5 s —
+              the service runs on the same host) and a read timeout chosen
+              per route by the caller.
+  breaker     after ML_BREAKER_FAILURES consecutive failures (connection
+              errors, timeouts, 5xx) the circuit opens and calls fail
+              immediately for ML_BREAKER_RESET seconds; then one trial
+              call is let through, and its outcome closes or re-opens it.
+              A down ML service costs callers nothing instead of a timeout
+              each.
+  passthrough proxy() returns the upstream body bytes and status as-is
+              rather than decoding and re-encoding the JSON; stream()
+              relays them chunk by chunk as they arrive (server-sent
+              events).
+"""
+
+import os
+import threading
+import time
+
+import requests
+from flask import Response, jsonify, stream_with_context
+from requests.adapters import HTTPAdapter
+
+ML_POOL_SIZE = int(os.getenv("ML_POOL_SIZE", "10"))
+ML_CONNECT_TIMEOUT = float(os.getenv("ML_CONNECT_TIMEOUT", "0.5"))
+ML_BREAKER_FAILURES = int(os.getenv("ML_BREAKER_FAILURES", "5"))
+ML_BREAKER_RESET = float(os.getenv("ML_BREAKER_RESET", "30"))
+
+
+class MLUnavailable(Exception):
+    """The ML service could not be reached, failed, or the circuit is open."""
+
+
+class MLClient:
+    """Pooled, circuit-broken client for the ML service.
+
+    Args:
+        base_url:          ML service root, e.g. "http://localhost:8001".
+        pool_size:         Keep-alive connections kept per process.
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_after:       Seconds the circuit stays open before a trial call.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = ML_POOL_SIZE,
+        failure_threshold: int = ML_BREAKER_FAILURES,
+        reset_after: float = ML_BREAKER_RESET,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    # -- circuit breaker -----------------------------------------------------
+
+    def _allow(self) -> tuple[bool, bool]:
+        """(allowed, is_trial) for a new call.
+
+        While the circuit is open only one trial call is admitted at a time,
+        and only once ML_BREAKER_RESET seconds have passed.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True, False
+            if time.monotonic() - self._opened_at < self.reset_after or self._trial_in_flight:
+                return False, False
+            self._trial_in_flight = True   # half-open: let one call through
+            return True, True
+
+    def _record(self, ok: bool, trial: bool) -> None:
+        with self._lock:
+            if trial:
+                # Only the trial call decides whether a half-open circuit closes
+                self._trial_in_flight = False
+                if ok:
+                    self._failures = 0
+                    self._opened_at = None
+                else:
+                    self._opened_at = time.monotonic()
+                return
+            if self._opened_at is not None:
+                # A call admitted before the circuit opened; its outcome is stale
+                return
+            if ok:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                print(f"[ml-client] Circuit opened after {self._failures} failures")
+                self._opened_at = time.monotonic()
+
+    def _release(self, trial: bool) -> None:
+        """End a call without counting its outcome either way."""
+        if trial:
+            with self._lock:
+                self._trial_in_flight = False
+
+    @property
+    def circuit_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    # -- requests ------------------------------------------------------------
+
+    def request(
+        self, method: str, path: str, timeout: float, count_timeout: bool = True, **kwargs
+    ) -> requests.Response:
+        """Send a request to the ML service.
+
+        timeout is the read timeout for this route; the connect timeout is
+        ML_CONNECT_TIMEOUT. Responses below 500 are returned whatever their
+        status. Raises MLUnavailable for connection errors, timeouts, 5xx
+        responses and while the circuit is open.
+
+        Pass count_timeout=False when timeout is the caller's own deadline
+        rather than the route's: a read timeout then says nothing about the
+        service's health and is not counted towards opening the circuit.
+        """
+        allowed, trial = self._allow()
+        if not allowed:
+            raise MLUnavailable("circuit open")
+        try:
+            resp = self._session.request(
+                method, f"{self.base_url}{path}",
+                timeout=(ML_CONNECT_TIMEOUT, timeout), **kwargs,
+            )
+        except requests.exceptions.ReadTimeout as exc:
+            if count_timeout:
+                self._record(False, trial)
+            else:
+                self._release(trial)
+            raise MLUnavailable(str(exc)) from exc
+        except requests.exceptions.RequestException as exc:
+            self._record(False, trial)
+            raise MLUnavailable(str(exc)) from exc
+        self._record(resp.status_code < 500, trial)
+        if resp.status_code >= 500:
+            # With stream=True the body is unread; release the connection to the pool
+            resp.close()
+            raise MLUnavailable(f"HTTP {resp.status_code}")
+        return resp
+
+    def proxy(self, method: str, path: str, timeout: float, unavailable: dict | None = None, **kwargs):
+        """Flask response relaying the ML service's reply byte for byte.
+
+        On MLUnavailable, returns `unavailable` (default
+        {"error": "ml_service_unavailable"}) with HTTP 503.
+        """
+        try:
+            resp = self.request(method, path, timeout, **kwargs)
+        except MLUnavailable:
+            return jsonify(unavailable or {"error": "ml_service_unavailable"}), 503
+        return Response(
+            resp.content,
+            status=resp.status_code,
+            content_type=resp.headers.get("Content-Type", "application/json"),
+        )
+
+    def stream(self, method: str, path: str, timeout: float, unavailable: dict | None = None, **kwargs):
+        """Flask response relaying the ML service's reply as it arrives.
+
+        Nothing is buffered on this side: each chunk read from the upstream
+        connection is written to the client straight away, and proxies are
+        asked not to buffer either. timeout bounds the wait for each chunk,
+        not the whole response. On MLUnavailable, returns `unavailable` with
+        HTTP 503 as proxy() does. If the upstream connection breaks mid-way
+        through an event stream, a final `error` event is sent so the client
+        can tell the response is incomplete.
+        """
+        try:
+            resp = self.request(method, path, timeout, stream=True, **kwargs)
+        except MLUnavailable:
+            return jsonify(unavailable or {"error": "ml_service_unavailable"}), 503
+
+        content_type = resp.headers.get("Content-Type", "application/json")
+
+        def relay():
+            try:
+                yield from resp.iter_content(chunk_size=None)
+            except requests.exceptions.RequestException as exc:
+                print(f"[ml-client] Stream from {path} interrupted: {exc}")
+                if content_type.startswith("text/event-stream"):
+                    # Tell the client the answer is incomplete; the leading blank
+                    # line ends any event the upstream was cut off in the middle of
+                    yield b'\n\nevent: error\ndata: {"error": "stream_interrupted"}\n\n'
+            finally:
+                resp.close()
+
+        return Response(
+            stream_with_context(relay()),
+            status=resp.status_code,
+            content_type=content_type,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
@@ -0,0 +1,126 @@
+"""
+Background delivery of workout-write notifications to the ML service.
+
+Saving a workout must cost no more than the database commit. Routes hand a
+notification to MLEventDispatcher.workout_saved(), which only appends it to
+a bounded in-process queue; a daemon worker thread delivers it through the
+shared MLClient (ml_client.py), so it reuses the pooled connections and
+stops sending while the ML service's circuit is open.
+
+The worker drains everything that has queued up (after a short linger so a
+burst of saves travels together) and sends one POST per user, carrying that
+user's writes in order. A user who logs three workouts while the ML service
+is slow costs one call, not three times seven.
+
+Delivery is best effort. When the queue is full the notification is
+dropped, and failed calls are not retried: every ML cache entry is stamped
+with users.training_data_version, so a lost notification only means the ML
+service refits on its next read instead of updating in place.
+
+The thread starts on first use in each process, so it is created after
+gunicorn forks its workers.
+"""
+
+import os
+import queue
+import threading
+import time
+
+from ml_client import MLClient, MLUnavailable
+
+ML_EVENT_QUEUE_SIZE = int(os.getenv("ML_EVENT_QUEUE_SIZE", "1000"))
+_TIMEOUT = 2          # seconds per POST
+_LINGER = 0.05        # seconds to wait for more events after the first
+_MAX_BATCH = 200      # events taken off the queue per send cycle
+
+
+class MLEventDispatcher:
+    """Bounded queue + worker thread posting 1RM updates to the ML service.
+
+    Args:
+        client:    Shared MLClient used for delivery.
+        max_queue: Events held before new ones are dropped.
+    """
+
+    def __init__(self, client: MLClient, max_queue: int = ML_EVENT_QUEUE_SIZE):
+        self.client = client
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid = None
+        self.dropped = 0
+        self.failed = 0
+
+    def workout_saved(self, user_id: int, data_version: int, sets_by_slug: dict) -> bool:
+        """Queue a 1RM update for a saved workout; never blocks.
+
+        sets_by_slug maps every tracked movement slug to the sets the write
+        added ({"weight", "reps"} dicts, [] when the movement was not in it).
+        Returns False if the queue was full and the event was dropped.
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((user_id, {"data_version": data_version, "movements": sets_by_slug}))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _worker_running(self, pid: int) -> bool:
+        return self._thread is not None and self._pid == pid and self._thread.is_alive()
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread if this process has none (or it has died)."""
+        pid = os.getpid()
+        if self._worker_running(pid):
+            return
+        with self._lock:
+            if not self._worker_running(pid):
+                self._pid = pid
+                self._thread = threading.Thread(target=self._run, name="ml-events", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            time.sleep(_LINGER)
+            while len(batch) < _MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                # One call per user, their writes in the order they were saved
+                updates_by_user: dict[int, list] = {}
+                for user_id, update in batch:
+                    updates_by_user.setdefault(user_id, []).append(update)
+                for user_id, updates in updates_by_user.items():
+                    try:
+                        self._send(user_id, updates)
+                    except Exception as exc:
+                        # Anything unexpected must not take the worker down with it
+                        self.failed += 1
+                        print(f"[ml-events] 1RM update for user {user_id} failed: {exc!r}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _send(self, user_id: int, updates: list) -> None:
+        try:
+            resp = self.client.request(
+                "POST", "/api/ml/bayesian/1rm/update:batch",
+                timeout=_TIMEOUT,
+                json={"user_id": user_id, "updates": updates},
+            )
+        except MLUnavailable as exc:
+            self.failed += 1
+            print(f"[ml-events] 1RM update for user {user_id} not delivered: {exc}")
+            return
+        if resp.status_code >= 400:
+            self.failed += 1
+            print(f"[ml-events] 1RM update for user {user_id} rejected: HTTP {resp.status_code}")
+
+    def join(self) -> None:
+        """Block until every queued event has been handled (for scripts and shutdown)."""
+        self._queue.join()
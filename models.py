@@ -16,6 +16,8 @@ class User(UserMixin, db.Model):
     timezone_offset = db.Column(db.Integer, default=0)  # Hours offset from UTC — kept in sync by API
     timezone = db.Column(db.String(64), default='UTC')  # IANA timezone name (e.g., "America/New_York")
     weekly_goal = db.Column(db.Integer, default=3)  # Manual weekly workout goal
+    # Bumped on every workout write; the ML service stamps cached results with it
+    training_data_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
 
     # Relationships
     workouts = db.relationship('Workout', backref='user', lazy=True, cascade='all, delete-orphan')
@@ -54,6 +56,11 @@ class BodyMetrics(db.Model):
         }
 
 class Workout(db.Model):
+    __table_args__ = (
+        # Serves every per-user listing: user's completed workouts ordered by date
+        db.Index('ix_workout_user_draft_date', 'user_id', 'is_draft', 'date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -90,8 +97,13 @@ class Exercise(db.Model):
     is_superset = db.Column(db.Boolean, default=False)  # Whether this is a superset exercise
     superset_exercise_name = db.Column(db.String(100), nullable=True)  # Name of the second exercise in superset
     original_name = db.Column(db.String(100), nullable=True)  # Pre-normalization name (audit trail)
+    # Normalized copy of set_data (one row per top-level set) for SQL aggregates
+    set_entries = db.relationship('ExerciseSet', backref='exercise', lazy=True,
+                                  cascade='all, delete-orphan', order_by='ExerciseSet.set_number')
 
     def to_dict(self):
+        # set_data stays the source for the API: drop-set stages and superset
+        # A/B values only live in the JSON, not in exercise_set
         import json
         return {
             'id': self.id,
@@ -107,6 +119,79 @@ class Exercise(db.Model):
             'superset_exercise_name': self.superset_exercise_name
         }
 
+class ExerciseSet(db.Model):
+    """One logged set of an Exercise, normalized out of Exercise.set_data."""
+    __tablename__ = 'exercise_set'
+
+    id = db.Column(db.Integer, primary_key=True)
+    exercise_id = db.Column(db.Integer, db.ForeignKey('exercise.id', ondelete='CASCADE'), nullable=False, index=True)
+    set_number = db.Column(db.Integer, nullable=False)
+    reps = db.Column(db.Integer, nullable=True)
+    weight = db.Column(db.Float, nullable=True)  # Null for bodyweight sets
+    completed = db.Column(db.Boolean, default=True, nullable=False)
+
+    @staticmethod
+    def from_set_data(set_data):
+        """Build ExerciseSet rows from a parsed set_data list.
+
+        Mirrors how the ML engines read set_data: reps/weight from each
+        top-level set, `completed` defaulting to True when absent. Entries
+        that are not objects are skipped.
+        """
+        rows = []
+        for idx, s in enumerate(set_data or []):
+            if not isinstance(s, dict):
+                continue
+            rows.append(ExerciseSet(
+                set_number=_to_number(s.get('set_number'), int) or idx + 1,
+                reps=_to_number(s.get('reps'), int),
+                weight=_to_number(s.get('weight'), float),
+                completed=bool(s.get('completed', True)),
+            ))
+        return rows
+
+    def to_dict(self):
+        return {
+            'set_number': self.set_number,
+            'reps': self.reps,
+            'weight': self.weight,
+            'completed': self.completed
+        }
+
+
+def _to_number(value, cast):
+    """cast(value), or None for blanks and unparseable values."""
+    if value is None or value == '':
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
+
+class DailyTrainingLoad(db.Model):
+    """Per-user, per-local-day volume-load rollup read by the fatigue engine.
+
+    Maintained on every workout write by training_load.refresh_training_load();
+    rebuild with backfill_training_load.py.
+    """
+    __tablename__ = 'daily_training_load'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    local_date = db.Column(db.Date, primary_key=True)  # Workout date in the user's timezone
+    volume_load = db.Column(db.Float, nullable=False, default=0.0)  # Σ reps × weight, bodyweight excluded
+    workout_count = db.Column(db.Integer, nullable=False, default=0)  # Completed workouts incl. rest days
+    acute_load = db.Column(db.Float, nullable=True)  # EWMA(span=7) of daily VL as of this day
+    chronic_load = db.Column(db.Float, nullable=True)  # EWMA(span=28) of daily VL as of this day
+
+    def to_dict(self):
+        return {
+            'local_date': self.local_date.strftime('%Y-%m-%d'),
+            'volume_load': self.volume_load,
+            'workout_count': self.workout_count,
+            'acute_load': self.acute_load,
+            'chronic_load': self.chronic_load
+        }
+
 class Meal(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -0,0 +1,236 @@
+"""
+Shared query helpers for workout listings.
+
+Workout.to_dict() touches `exercises` and `template` on every row; building
+a listing from a plain query therefore costs two extra SELECTs per workout.
+The helpers here attach the eager-loading options once so every listing
+route serializes from rows that are already in the session.
+"""
+
+import base64
+import binascii
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import joinedload, selectinload
+
+from models import db, Exercise, Workout, WorkoutTemplate
+
+
+def completed_workouts_query(user_id):
+    """Non-draft workouts for a user with exercises and template preloaded.
+
+    `exercises` is loaded with a single IN (...) query (selectinload) so the
+    workout rows are not multiplied by their exercise count; `template` is a
+    many-to-one and rides along on the main query via a LEFT OUTER JOIN.
+    """
+    return (
+        Workout.query
+        .filter(Workout.user_id == user_id, Workout.is_draft == False)
+        .options(
+            selectinload(Workout.exercises),
+            joinedload(Workout.template),
+        )
+    )
+
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination
+# ---------------------------------------------------------------------------
+# Listings are ordered newest-first on (Workout.date, Workout.id). A cursor
+# encodes the (date, id) of a boundary row, so fetching any page is an index
+# range scan on workout(user_id, is_draft, date) regardless of how deep into
+# a user's history it is — no OFFSET.
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(workout):
+    """Opaque cursor string for a workout row."""
+    raw = f"{workout.date.isoformat()}|{workout.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor(). Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_str, id_str = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(date_str), int(id_str)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError('invalid cursor')
+
+
+def _parse_bound(value, end=False):
+    """Parse a from/to query value (YYYY-MM-DD or ISO datetime).
+
+    A bare date used as an upper bound covers that whole day.
+    """
+    if len(value) == 10:
+        day = datetime.strptime(value, '%Y-%m-%d')
+        return day + timedelta(days=1) if end else day
+    return datetime.fromisoformat(value.replace('Z', ''))
+
+
+def parse_page_args(args):
+    """Read limit/before/after/from/to from request args.
+
+    Returns a dict of keyword arguments for paginate_workouts().
+    Raises ValueError with a user-facing message on bad input.
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    limit = max(1, min(MAX_PAGE_SIZE, limit))
+
+    before = args.get('before')
+    after = args.get('after')
+    if before and after:
+        raise ValueError('before and after are mutually exclusive')
+
+    try:
+        date_from = _parse_bound(args['from']) if args.get('from') else None
+        date_to = _parse_bound(args['to'], end=True) if args.get('to') else None
+    except ValueError:
+        raise ValueError('from/to must be YYYY-MM-DD or ISO datetimes')
+
+    return {
+        'limit': limit,
+        'before': decode_cursor(before) if before else None,
+        'after': decode_cursor(after) if after else None,
+        'date_from': date_from,
+        'date_to': date_to,
+    }
+
+
+def paginate_workouts(query, limit=DEFAULT_PAGE_SIZE, before=None, after=None,
+                      date_from=None, date_to=None):
+    """Fetch one newest-first page of workouts from `query`.
+
+    before: (date, id) — return rows strictly older than this cursor
+    after:  (date, id) — return rows strictly newer than this cursor
+    date_from / date_to: inclusive lower / exclusive upper bound on Workout.date
+
+    Returns {'workouts': [Workout], 'next_cursor': str|None, 'prev_cursor': str|None}
+    where next_cursor pages towards older workouts and prev_cursor towards
+    newer ones.
+    """
+    if date_from is not None:
+        query = query.filter(Workout.date >= date_from)
+    if date_to is not None:
+        query = query.filter(Workout.date < date_to)
+
+    if after is not None:
+        # Walk forward in time from the cursor, then flip back to newest-first
+        query = query.filter(tuple_(Workout.date, Workout.id) > after)
+        rows = query.order_by(Workout.date.asc(), Workout.id.asc()).limit(limit + 1).all()
+        has_newer, has_older = len(rows) > limit, True
+        rows = rows[:limit][::-1]
+    else:
+        if before is not None:
+            query = query.filter(tuple_(Workout.date, Workout.id) < before)
+        rows = query.order_by(Workout.date.desc(), Workout.id.desc()).limit(limit + 1).all()
+        has_newer, has_older = before is not None, len(rows) > limit
+        rows = rows[:limit]
+
+    return {
+        'workouts': rows,
+        'next_cursor': encode_cursor(rows[-1]) if rows and has_older else None,
+        'prev_cursor': encode_cursor(rows[0]) if rows and has_newer else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Calendar
+# ---------------------------------------------------------------------------
+# Workout.date is stored in UTC; the calendar groups by the user's local day
+# (UTC + timezone_offset hours), matching the rest of the app.
+
+
+def parse_month(value):
+    """Parse 'YYYY-MM' into the first day of that month. Raises ValueError."""
+    return datetime.strptime(value, '%Y-%m')
+
+
+def _local_window(start_local, end_local, offset_hours):
+    """Convert a [start, end) local-time window to UTC bounds on Workout.date."""
+    shift = timedelta(hours=offset_hours)
+    return start_local - shift, end_local - shift
+
+
+def calendar_month_summary(user_id, month_start, offset_hours=0):
+    """Per-local-day workout summaries for one calendar month.
+
+    Exercise counts and template details are aggregated in SQL, one row per
+    workout in the month; only those rows are bucketed into local days here.
+
+    Returns {'YYYY-MM-DD': {
+        'count':          int,        # logged entries incl. rest days
+        'session_count':  int,        # entries that are not rest days
+        'exercise_count': int,        # exercises across those sessions
+        'rest_day':       bool,       # every entry that day is a rest day
+        'template_names': [str],      # template of each named session, in order
+        'template_color': str|None,   # colour of the first templated session
+    }}
+    """
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    start_utc, end_utc = _local_window(month_start, next_month, offset_hours)
+
+    rows = (
+        db.session.query(
+            Workout.date,
+            Workout.is_rest_day,
+            WorkoutTemplate.name,
+            WorkoutTemplate.color,
+            func.count(Exercise.id),
+        )
+        .outerjoin(WorkoutTemplate, Workout.template_id == WorkoutTemplate.id)
+        .outerjoin(Exercise, Exercise.workout_id == Workout.id)
+        .filter(
+            Workout.user_id == user_id,
+            Workout.is_draft == False,
+            Workout.date >= start_utc,
+            Workout.date < end_utc,
+        )
+        .group_by(Workout.id, Workout.date, Workout.is_rest_day,
+                  WorkoutTemplate.name, WorkoutTemplate.color)
+        .order_by(Workout.date.asc(), Workout.id.asc())
+        .all()
+    )
+
+    days = {}
+    for date, is_rest_day, template_name, template_color, exercise_count in rows:
+        key = (date + timedelta(hours=offset_hours)).strftime('%Y-%m-%d')
+        day = days.setdefault(key, {
+            'count': 0,
+            'session_count': 0,
+            'exercise_count': 0,
+            'rest_day': True,
+            'template_names': [],
+            'template_color': None,
+        })
+        day['count'] += 1
+        if is_rest_day:
+            continue
+        day['rest_day'] = False
+        day['session_count'] += 1
+        day['exercise_count'] += exercise_count
+        if template_name:
+            day['template_names'].append(template_name)
+            if day['template_color'] is None:
+                day['template_color'] = template_color
+    return days
+
+
+def workouts_on_local_day(user_id, day, offset_hours=0):
+    """Completed workouts (fully loaded) whose local date is `day`."""
+    start_utc, end_utc = _local_window(day, day + timedelta(days=1), offset_hours)
+    return (
+        completed_workouts_query(user_id)
+        .filter(Workout.date >= start_utc, Workout.date < end_utc)
+        .order_by(Workout.date.asc(), Workout.id.asc())
+        .all()
+    )
@@ -0,0 +1,218 @@
+"""
+Daily training-load rollup maintenance.
+
+Keeps daily_training_load (one row per user per local day) in step with the
+workout tables so the fatigue engine can read a compact daily series
+instead of re-aggregating a user's entire exercise history.
+
+Volume Load follows the fatigue engine's definition:
+  per exercise : Σ(reps × weight) over exercise_set rows when it has any,
+                 otherwise sets × reps × weight from the top-level columns
+  bodyweight   : weight NULL or 0 contributes nothing
+  rest days    : counted as a workout with 0 VL
+
+Days are local to the user (Workout.date is UTC, shifted by timezone_offset),
+matching the calendar and the rest of the app.
+
+Each row also carries the acute (span 7) and chronic (span 28) EWMA of the
+daily VL series as of that day. adjust=False EWMA is a plain recurrence, so
+a day's state follows from the previous logged day's state alone:
+
+  y_day = y_prev × (1 − α)^gap + α × VL_day      α = 2 / (span + 1)
+
+where gap is the number of days since the previous row (the unlogged days
+in between are zero-VL days). Appending a day touches one row; a back-dated
+edit re-walks only the rows from the edited day forward.
+
+Both entry points also bump users.training_data_version. Every workout
+write already goes through one of them, and the ML service compares the
+version against the one stamped on each cached result, so its caches
+notice changes without being told.
+
+Callers stage changes in the current session; nothing here commits.
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import case, func
+
+
+from models import db, DailyTrainingLoad, Exercise, ExerciseSet, User, Workout
+
+# EWMA spans — must match the fatigue engine (fitglyph-ml/fatigue/compute.py)
+ACUTE_SPAN = 7
+CHRONIC_SPAN = 28
+_ACUTE_DECAY = 1 - 2 / (ACUTE_SPAN + 1)
+_CHRONIC_DECAY = 1 - 2 / (CHRONIC_SPAN + 1)
+
+
+def local_day(dt, offset_hours):
+    """Local calendar date of a UTC workout datetime."""
+    return (dt + timedelta(hours=offset_hours)).date()
+
+
+def _utc_day_start(day, offset_hours):
+    """UTC datetime at which a local calendar day begins."""
+    return datetime(day.year, day.month, day.day) - timedelta(hours=offset_hours)
+
+
+def _workout_loads(user_id, start_utc=None, end_utc=None):
+    """(date, is_rest_day, volume_load) for each completed workout, via SQL."""
+    set_vl = func.sum(case(
+        (ExerciseSet.weight > 0, func.coalesce(ExerciseSet.reps, 0) * ExerciseSet.weight),
+        else_=0,
+    ))
+    exercise_vl = case(
+        (func.count(ExerciseSet.id) > 0, set_vl),
+        (Exercise.weight > 0,
+         func.coalesce(Exercise.sets, 0) * func.coalesce(Exercise.reps, 0) * Exercise.weight),
+        else_=0,
+    )
+
+    def in_window(query):
+        query = query.filter(Workout.user_id == user_id, Workout.is_draft == False)
+        if start_utc is not None:
+            query = query.filter(Workout.date >= start_utc, Workout.date < end_utc)
+        return query
+
+    per_exercise = in_window(
+        db.session.query(Exercise.workout_id.label('workout_id'), exercise_vl.label('vl'))
+        .join(Workout, Workout.id == Exercise.workout_id)
+        .outerjoin(ExerciseSet, ExerciseSet.exercise_id == Exercise.id)
+    ).group_by(Exercise.id, Exercise.workout_id, Exercise.sets, Exercise.reps, Exercise.weight).subquery()
+
+    return in_window(
+        db.session.query(Workout.date, Workout.is_rest_day, func.coalesce(func.sum(per_exercise.c.vl), 0))
+        .outerjoin(per_exercise, per_exercise.c.workout_id == Workout.id)
+    ).group_by(Workout.id, Workout.date, Workout.is_rest_day).all()
+
+
+def _advance_ewma(state, day, volume_load):
+    """(day, acute, chronic) after adding `day`'s VL to the previous state.
+
+    state is the (day, acute, chronic) of the previous logged day, or None
+    for a user's first day (both EWMAs start at that day's VL).
+    """
+    if state is None:
+        return day, volume_load, volume_load
+    prev_day, acute, chronic = state
+    gap = (day - prev_day).days
+    return (
+        day,
+        acute * _ACUTE_DECAY ** gap + (1 - _ACUTE_DECAY) * volume_load,
+        chronic * _CHRONIC_DECAY ** gap + (1 - _CHRONIC_DECAY) * volume_load,
+    )
+
+
+def _recompute_ewma_from(user_id, from_day):
+    """Re-walk the EWMA state of every rollup row on or after from_day.
+
+    Starts from the stored state of the last row before from_day, so the
+    cost is proportional to the number of days after the edit, not to the
+    length of the user's history.
+    """
+    rows_query = DailyTrainingLoad.query.filter(DailyTrainingLoad.user_id == user_id)
+
+    anchor = (
+        rows_query.filter(DailyTrainingLoad.local_date < from_day)
+        .order_by(DailyTrainingLoad.local_date.desc())
+        .first()
+    )
+    if anchor is not None and anchor.acute_load is None:
+        # Rows predating the EWMA columns — walk the whole history once
+        anchor, from_day = None, date.min
+
+    state = None
+    if anchor is not None:
+        state = (anchor.local_date, anchor.acute_load, anchor.chronic_load)
+
+    rows = (
+        rows_query.filter(DailyTrainingLoad.local_date >= from_day)
+        .order_by(DailyTrainingLoad.local_date.asc())
+        .all()
+    )
+    for row in rows:
+        state = _advance_ewma(state, row.local_date, row.volume_load)
+        row.acute_load, row.chronic_load = state[1], state[2]
+
+
+def _daily_totals(loads, offset_hours):
+    """Bucket workout loads into {local_date: [volume_load, workout_count]}."""
+    totals = {}
+    for date, is_rest_day, vl in loads:
+        day = totals.setdefault(local_day(date, offset_hours), [0.0, 0])
+        day[0] += 0.0 if is_rest_day else float(vl or 0.0)
+        day[1] += 1
+    return totals
+
+
+def bump_training_data_version(user):
+    """Mark the user's training data as changed.
+
+    Issued as `SET training_data_version = training_data_version + 1`, so
+    concurrent writes never lose an increment.
+    """
+    user.training_data_version = User.training_data_version + 1
+
+
+def refresh_training_load(user, workout_dates):
+    """Recompute the rollup rows for the local days touched by a write.
+
+    workout_dates: UTC datetimes of the workouts written — pass both the old
+    and the new date when a workout moves between days. Each affected day is
+    recomputed from the source tables, so repeated or overlapping refreshes
+    can never drift; EWMA state is then re-walked from the earliest
+    affected day forward.
+
+    A user with no rollup rows yet (history predating the rollup, never
+    backfilled) gets a full rebuild instead: creating just the touched day
+    would hide every earlier workout from the fatigue engine, which only
+    falls back to the raw tables while the rollup is empty.
+    """
+    if not DailyTrainingLoad.query.filter_by(user_id=user.id).first():
+        rebuild_training_load(user)
+        return
+
+    bump_training_data_version(user)
+    offset_hours = user.timezone_offset or 0
+    days = {local_day(d, offset_hours) for d in workout_dates if d is not None}
+
+    for day in days:
+        start_utc = _utc_day_start(day, offset_hours)
+        totals = _daily_totals(
+            _workout_loads(user.id, start_utc, start_utc + timedelta(days=1)), offset_hours
+        ).get(day)
+
+        row = db.session.get(DailyTrainingLoad, (user.id, day))
+        if totals is None:
+            if row is not None:
+                db.session.delete(row)
+            continue
+        if row is None:
+            row = DailyTrainingLoad(user_id=user.id, local_date=day)
+            db.session.add(row)
+        row.volume_load, row.workout_count = totals
+
+    if days:
+        _recompute_ewma_from(user.id, min(days))
+
+
+def rebuild_training_load(user):
+    """Drop and recompute every rollup row for a user.
+
+    Used by the backfill script and whenever the user's timezone offset
+    changes (which moves workouts between local days).
+    """
+    bump_training_data_version(user)
+    DailyTrainingLoad.query.filter_by(user_id=user.id).delete()
+    totals = _daily_totals(_workout_loads(user.id), user.timezone_offset or 0)
+
+    state = None
+    for day in sorted(totals):
+        vl, count = totals[day]
+        state = _advance_ewma(state, day, vl)
+        db.session.add(DailyTrainingLoad(
+            user_id=user.id, local_date=day, volume_load=vl, workout_count=count,
+            acute_load=state[1], chronic_load=state[2],
+        ))
+    return len(totals)